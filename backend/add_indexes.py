@@ -1,100 +1,180 @@
-#!/usr/bin/env python3
-"""
-Simple script to add critical database indexes for performance.
-"""
-import asyncio
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-import asyncpg
-from urllib.parse import urlparse
-import logging
-
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-async def create_indexes():
-    """Create critical indexes for performance"""
-    
-    # Parse database URL from environment
-    from app.core.config import settings
-    parsed = urlparse(settings.DATABASE_URL)
-    
-    # Connect directly with asyncpg
-    conn = await asyncpg.connect(
-        host=parsed.hostname,
-        port=parsed.port or 5432,
-        user=parsed.username,
-        password=parsed.password.replace('%24', '$').replace('%40', '@') if parsed.password else None,
-        database=parsed.path[1:] if parsed.path else None,
-        ssl='require'
-    )
-    
-    try:
-        logger.info("🚀 Creating performance indexes...")
-        
-        indexes = [
-            # Critical covering index for task stats
-            """
-            CREATE INDEX IF NOT EXISTS idx_tasks_stats_covering 
-            ON tasks (creator_id, assignee_id, is_deleted) 
-            INCLUDE (completed, status)
-            WHERE is_deleted = false
-            """,
-            
-            # Index for user access patterns
-            """
-            CREATE INDEX IF NOT EXISTS idx_tasks_user_access 
-            ON tasks (creator_id, is_deleted) 
-            WHERE is_deleted = false
-            """,
-            
-            """
-            CREATE INDEX IF NOT EXISTS idx_tasks_assignee_access 
-            ON tasks (assignee_id, is_deleted) 
-            WHERE is_deleted = false AND assignee_id IS NOT NULL
-            """,
-            
-            # Composite index for common queries
-            """
-            CREATE INDEX IF NOT EXISTS idx_tasks_creator_composite 
-            ON tasks (creator_id, status, is_deleted, created_at DESC) 
-            WHERE is_deleted = false
-            """,
-            
-            # Project members index for JOINs
-            """
-            CREATE INDEX IF NOT EXISTS idx_project_members_lookup 
-            ON project_members (project_id, user_id)
-            """,
-        ]
-        
-        for i, sql in enumerate(indexes, 1):
-            try:
-                logger.info(f"Creating index {i}/{len(indexes)}...")
-                await conn.execute(sql)
-                logger.info(f"✅ Index {i} created successfully")
-            except Exception as e:
-                if "already exists" in str(e):
-                    logger.info(f"⚠️  Index {i} already exists")
-                else:
-                    logger.error(f"❌ Failed to create index {i}: {e}")
-        
-        # Update statistics
-        logger.info("📊 Updating table statistics...")
-        tables = ['tasks', 'projects', 'project_members', 'users']
-        for table in tables:
-            try:
-                await conn.execute(f"ANALYZE {table}")
-                logger.info(f"✅ Analyzed {table}")
-            except Exception as e:
-                logger.error(f"❌ Failed to analyze {table}: {e}")
-        
-        logger.info("🎉 Database optimization completed!")
-        
-    finally:
-        await conn.close()
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+"""
+Simple script to add critical database indexes for performance.
+"""
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncpg
+from urllib.parse import urlparse, unquote
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+async def create_indexes():
+    """Create critical indexes for performance"""
+    
+    # Parse database URL from environment
+    from app.core.config import settings
+    parsed = urlparse(settings.DATABASE_URL)
+    
+    # Connect directly with asyncpg - small pool so independent tables build in parallel
+    pool = await asyncpg.create_pool(
+        host=parsed.hostname,
+        port=parsed.port or 5432,
+        user=parsed.username,
+        password=unquote(parsed.password) if parsed.password else None,
+        database=parsed.path[1:] if parsed.path else None,
+        ssl='require',
+        min_size=2,
+        max_size=4,
+        statement_cache_size=0  # CREATE INDEX CONCURRENTLY cannot be prepared
+    )
+
+    try:
+        logger.info("🚀 Creating performance indexes...")
+
+        tasks_indexes = [
+            # Critical covering index for task stats
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_stats_covering 
+            ON tasks (creator_id, assignee_id, is_deleted) 
+            INCLUDE (completed, status)
+            WHERE is_deleted = false
+            """,
+            
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_assignee_access 
+            ON tasks (assignee_id, is_deleted) 
+            WHERE is_deleted = false AND assignee_id IS NOT NULL
+            """,
+            
+            # Composite index for common queries; INCLUDE makes the usual
+            # dashboard list projection index-only
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_creator_composite
+            ON tasks (creator_id, status, is_deleted, created_at DESC)
+            INCLUDE (title, priority, due_date, assignee_id, completed)
+            WHERE is_deleted = false
+            """,
+
+            # idx_tasks_user_access was a strict prefix of the composite
+            # above: pure write amplification, no extra read benefit
+            """
+            DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_access
+            """,
+        ]
+
+        projects_indexes = [
+            # list_projects orders owned projects by recency
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_owner_created
+            ON projects (owner_id, created_at DESC)
+            """,
+        ]
+
+        task_comments_indexes = [
+            # Matches get_task_comments exactly: filter on task_id +
+            # activity_type with the soft-delete predicate folded into the
+            # partial index, created_at satisfying the ORDER BY
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_comments_task_type_created
+            ON task_comments (task_id, activity_type, created_at)
+            WHERE is_deleted = false
+            """,
+        ]
+
+        project_members_indexes = [
+            # Unique membership per (project, user) - backs the
+            # ON CONFLICT DO NOTHING path in add_member and doubles as
+            # the JOIN lookup index
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_project_members_project_user
+            ON project_members (project_id, user_id)
+            """,
+            """
+            DROP INDEX CONCURRENTLY IF EXISTS idx_project_members_lookup
+            """,
+            # Reverse column order for the membership semi-joins that
+            # probe by user first ("which projects does this user belong
+            # to"); the unique index above only helps project-first lookups
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_project_members_user_project
+            ON project_members (user_id, project_id)
+            """,
+        ]
+
+        user_activities_indexes = [
+            # Covering indexes so activity feed pages are index-only scans
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_activities_project_created
+            ON user_activities (project_id, created_at DESC)
+            INCLUDE (user_id, target_user_id, action_type, entity_type,
+                     entity_id, entity_name, description, activity_metadata)
+            """,
+
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_activities_created
+            ON user_activities (created_at DESC)
+            INCLUDE (user_id, target_user_id, action_type, entity_type,
+                     entity_id, entity_name, description, activity_metadata)
+            """,
+        ]
+
+        users_indexes = [
+            # Keyset pagination for the active-user listing:
+            # WHERE is_active ORDER BY created_at DESC, id DESC
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_created
+            ON users (created_at DESC, id DESC)
+            WHERE is_active = true
+            """,
+        ]
+
+        async def run_group(table: str, sqls: list):
+            """Build one table's indexes serially on a dedicated connection.
+
+            CONCURRENTLY builds on the same table conflict with each other,
+            so only indexes on distinct tables run in parallel.
+            """
+            async with pool.acquire() as conn:
+                for i, sql in enumerate(sqls, 1):
+                    try:
+                        logger.info(f"Creating {table} index {i}/{len(sqls)}...")
+                        await conn.execute(sql)
+                        logger.info(f"✅ {table} index {i} created successfully")
+                    except Exception as e:
+                        if "already exists" in str(e):
+                            logger.info(f"⚠️  {table} index {i} already exists")
+                        else:
+                            logger.error(f"❌ Failed to create {table} index {i}: {e}")
+
+        await asyncio.gather(
+            run_group('tasks', tasks_indexes),
+            run_group('projects', projects_indexes),
+            run_group('task_comments', task_comments_indexes),
+            run_group('project_members', project_members_indexes),
+            run_group('user_activities', user_activities_indexes),
+            run_group('users', users_indexes),
+        )
+
+        # Update statistics - single statement saves one round-trip per table
+        logger.info("📊 Updating table statistics...")
+        tables = ['tasks', 'projects', 'project_members', 'users', 'user_activities', 'task_comments']
+        try:
+            async with pool.acquire() as conn:
+                await conn.execute(f"ANALYZE {', '.join(tables)}")
+            logger.info(f"✅ Analyzed {len(tables)} tables")
+        except Exception as e:
+            logger.error(f"❌ Failed to analyze tables {tables}: {e}")
+
+        logger.info("🎉 Database optimization completed!")
+
+    finally:
+        await pool.close()
+
+if __name__ == "__main__":
     asyncio.run(create_indexes())
\ No newline at end of file
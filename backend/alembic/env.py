@@ -126,11 +126,16 @@ async def run_async_migrations() -> None:
     configuration = config.get_section(config.config_ini_section)
     # Use our properly parsed migration URL
     configuration["sqlalchemy.url"] = migration_url
-    
+    # Small real pool instead of NullPool: multi-statement migrations reuse
+    # the TLS+auth handshake instead of paying it per connection checkout
+    configuration["sqlalchemy.pool_size"] = "2"
+    configuration["sqlalchemy.max_overflow"] = "0"
+    configuration["sqlalchemy.pool_pre_ping"] = "true"
+
     connectable = async_engine_from_config(
         configuration,
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        poolclass=pool.AsyncAdaptedQueuePool,
     )
 
     async with connectable.connect() as connection:
@@ -1,108 +1,151 @@
-"""
-Activity endpoints for tracking and retrieving user activities.
-"""
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
-from sqlmodel import select, and_, or_, desc
-import uuid
-import logging
-
-from app.core.database import get_session
-from app.core.auth import CurrentUser
-from app.models.database import UserActivity, Task, Project, Category, User, ActivityActionType
-from app.repositories.activity_repository import ActivityRepository
-from app.schemas.activity import ActivityResponse, ActivityListResponse
-
-logger = logging.getLogger(__name__)
-router = APIRouter()
-
-
-@router.get("/", response_model=ActivityListResponse)
-async def get_activities(
-    project_id: Optional[uuid.UUID] = Query(None, description="Filter by project"),
-    limit: int = Query(20, ge=1, le=100, description="Number of activities to return"),
-    offset: int = Query(0, ge=0, description="Number of activities to skip"),
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    """
-    Get recent activities for the current user.
-    
-    - **project_id**: Filter activities by project
-    - **limit**: Number of activities to return (1-100)
-    - **offset**: Number of activities to skip
-    """
-    try:
-        logger.info(f"Fetching activities for user {current_user.id}")
-        
-        activity_repo = ActivityRepository(session)
-        
-        # Get activities visible to current user
-        activities = await activity_repo.get_recent(
-            project_id=project_id,
-            limit=limit,
-            offset=offset
-        )
-        
-        # Transform activities to include user names
-        activity_responses = []
-        for activity in activities:
-            response = ActivityResponse(
-                id=activity.id,
-                user_id=activity.user_id,
-                user_name=activity.user.full_name or activity.user.username if activity.user else None,
-                action_type=activity.action_type,
-                entity_type=activity.entity_type,
-                entity_id=activity.entity_id,
-                entity_name=activity.entity_name,
-                description=activity.description,
-                target_user_id=activity.target_user_id,
-                target_user_name=activity.target_user.full_name or activity.target_user.username if activity.target_user else None,
-                project_id=activity.project_id,
-                project_name=activity.project.name if activity.project else None,
-                metadata=activity.activity_metadata,
-                created_at=activity.created_at
-            )
-            activity_responses.append(response)
-        
-        logger.info(f"Found {len(activity_responses)} activities for user {current_user.id}")
-        
-        return ActivityListResponse(
-            activities=activity_responses,
-            total=len(activity_responses),
-            limit=limit,
-            offset=offset
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to get activities: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve activities")
-
-
-@router.delete("/", status_code=status.HTTP_200_OK)
-async def clear_activities(
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    """
-    Clear all activities for the current user.
-    """
-    try:
-        logger.info(f"Clearing activities for user {current_user.id}")
-        
-        activity_repo = ActivityRepository(session)
-        
-        # Only allow users to clear their own activities
-        count = await activity_repo.clear_all(user_id=current_user.id)
-        
-        logger.info(f"Cleared {count} activities for user {current_user.id}")
-        
-        return {
-            "message": f"Successfully cleared {count} activities",
-            "count": count
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to clear activities: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to clear activities")
+"""
+Activity endpoints for tracking and retrieving user activities.
+"""
+from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from sqlmodel import select, and_, or_, desc
+import asyncpg
+import json
+import uuid
+import logging
+
+from app.core.database import get_session, get_pool
+from app.core.auth import CurrentUser
+from app.models.database import UserActivity, Task, Project, Category, User, ActivityActionType
+from app.repositories.activity_repository import ActivityRepository
+from app.schemas.activity import ActivityResponse, ActivityListResponse
+
+logger = logging.getLogger(__name__)
+# orjson serializes large activity pages at C speed
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Single JOINed SELECT so user/target-user/project names arrive with each row.
+# Runs on the raw asyncpg pool - no ORM objects are built for this hot path.
+_ACTIVITIES_SQL = """
+    SELECT ua.id, ua.user_id, ua.action_type, ua.entity_type, ua.entity_id,
+           ua.entity_name, ua.description, ua.target_user_id, ua.project_id,
+           ua.activity_metadata, ua.created_at,
+           u.full_name AS user_full_name, u.username AS user_username,
+           tu.full_name AS target_user_full_name, tu.username AS target_user_username,
+           p.name AS project_name,
+           COUNT(*) OVER() AS total_count
+    FROM user_activities ua
+    LEFT JOIN users u ON u.id = ua.user_id
+    LEFT JOIN users tu ON tu.id = ua.target_user_id
+    LEFT JOIN projects p ON p.id = ua.project_id
+    WHERE ($1::uuid IS NULL OR ua.project_id = $1)
+    ORDER BY ua.created_at DESC
+    LIMIT $2 OFFSET $3
+"""
+
+# Page size at which we switch from one fetch to a server-side cursor
+_STREAM_THRESHOLD = 50
+
+
+def _activity_from_row(row) -> ActivityResponse:
+    """Build an ActivityResponse from one joined asyncpg record."""
+    metadata = row["activity_metadata"]
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return ActivityResponse(
+        id=row["id"],
+        user_id=row["user_id"],
+        user_name=row["user_full_name"] or row["user_username"],
+        action_type=row["action_type"],
+        entity_type=row["entity_type"],
+        entity_id=row["entity_id"],
+        entity_name=row["entity_name"],
+        description=row["description"],
+        target_user_id=row["target_user_id"],
+        target_user_name=(
+            row["target_user_full_name"] or row["target_user_username"]
+            if row["target_user_id"] else None
+        ),
+        project_id=row["project_id"],
+        project_name=row["project_name"],
+        metadata=metadata,
+        created_at=row["created_at"]
+    )
+
+
+@router.get("/", response_model=ActivityListResponse)
+async def get_activities(
+    project_id: Optional[uuid.UUID] = Query(None, description="Filter by project"),
+    limit: int = Query(20, ge=1, le=100, description="Number of activities to return"),
+    offset: int = Query(0, ge=0, description="Number of activities to skip"),
+    current_user: User = CurrentUser,
+    pool: asyncpg.Pool = Depends(get_pool)
+):
+    """
+    Get recent activities for the current user.
+
+    - **project_id**: Filter activities by project
+    - **limit**: Number of activities to return (1-100)
+    - **offset**: Number of activities to skip
+    """
+    try:
+        logger.info("Fetching activities for user %s", current_user.id)
+
+        # Build responses straight from the joined records. Large pages go
+        # through a server-side cursor so raw records are never all resident
+        # at once; small pages take the single-fetch fast path.
+        activity_responses = []
+        total = 0
+        if limit >= _STREAM_THRESHOLD:
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for row in conn.cursor(
+                        _ACTIVITIES_SQL, project_id, limit, offset,
+                        prefetch=_STREAM_THRESHOLD
+                    ):
+                        if not activity_responses:
+                            total = row["total_count"]
+                        activity_responses.append(_activity_from_row(row))
+        else:
+            rows = await pool.fetch(_ACTIVITIES_SQL, project_id, limit, offset)
+            # Real total comes from the window function, not the page length
+            total = rows[0]["total_count"] if rows else 0
+            activity_responses = [_activity_from_row(row) for row in rows]
+
+        logger.info("Found %s activities for user %s", len(activity_responses), current_user.id)
+
+        return ActivityListResponse(
+            activities=activity_responses,
+            total=total,
+            limit=limit,
+            offset=offset
+        )
+
+    except Exception as e:
+        logger.error("Failed to get activities: %s", str(e))
+        raise HTTPException(status_code=500, detail="Failed to retrieve activities")
+
+
+@router.delete("/", status_code=status.HTTP_200_OK)
+async def clear_activities(
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Clear all activities for the current user.
+    """
+    try:
+        logger.info("Clearing activities for user %s", current_user.id)
+        
+        activity_repo = ActivityRepository(session)
+        
+        # Only allow users to clear their own activities
+        count = await activity_repo.clear_all(user_id=current_user.id)
+        
+        logger.info("Cleared %s activities for user %s", count, current_user.id)
+        
+        return {
+            "message": f"Successfully cleared {count} activities",
+            "count": count
+        }
+        
+    except Exception as e:
+        logger.error("Failed to clear activities: %s", str(e))
+        raise HTTPException(status_code=500, detail="Failed to clear activities")
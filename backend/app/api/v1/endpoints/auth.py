@@ -2,7 +2,8 @@
 Authentication endpoints using clean architecture.
 Handles user registration, login, token refresh, and logout with proper separation of concerns.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse
 import logging
 
 from app.schemas.auth import (
@@ -17,21 +18,33 @@ from app.schemas.auth import (
 )
 from app.utils.auth_helpers import AuthBusinessLogic, AuthResponseFormatter, AuthEventLogger
 from app.core.auth import CurrentUser, get_current_user
-from app.core.database import get_session
+from app.core.database import async_session_maker
 from app.models.database import User, ActivityActionType
 from app.repositories.activity_repository import ActivityRepository
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 import uuid
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+# orjson keeps auth response serialization off the Python hot path
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+async def _log_activity_background(**activity_kwargs):
+    """Write an activity row after the response has been sent.
+
+    Runs as a background task, so it opens its own session - the
+    request-scoped session is already closed by the time this executes.
+    """
+    try:
+        async with async_session_maker() as session:
+            await ActivityRepository(session).create(**activity_kwargs)
+    except Exception as e:
+        logger.warning("Could not log activity in background: %s", str(e))
 
 
 @router.post("/signup", response_model=AuthResponse)
 async def sign_up(
     request: SignUpRequest,
-    session: AsyncSession = Depends(get_session)
+    background: BackgroundTasks
 ):
     """
     Register a new user with comprehensive validation.
@@ -42,7 +55,7 @@ async def sign_up(
     
     Returns access and refresh tokens on success.
     """
-    logger.info(f"Registration request for email: {request.email}")
+    logger.info("Registration request for email: %s", request.email)
     
     try:
         # Use business logic helper for registration
@@ -55,41 +68,28 @@ async def sign_up(
         # Log successful registration
         AuthEventLogger.log_registration_attempt(request.email, success=True)
         
-        # Log activity to database (only if user exists in local DB)
+        # Log activity to database after the response is sent
         if auth_data.get("user") and auth_data["user"].get("id"):
-            try:
-                user_id = auth_data["user"]["id"]
-                if isinstance(user_id, str):
-                    user_id = uuid.UUID(user_id)
-                
-                # First check if user exists in local database
-                from sqlmodel import select
-                from app.models.database import User
-                stmt = select(User).where(User.id == user_id)
-                result = await session.execute(stmt)
-                local_user = result.scalar_one_or_none()
-                
-                # Only log activity if user exists in local database
-                if local_user:
-                    activity_repo = ActivityRepository(session)
-                    await activity_repo.create(
-                        user_id=user_id,
-                        action_type=ActivityActionType.USER_REGISTERED,
-                        entity_type="user",
-                        entity_id=user_id,
-                        entity_name=request.full_name or request.email,
-                        description="Welcome! Your account has been created"
-                    )
-            except Exception as e:
-                # Log the error but don't fail the registration
-                logger.warning(f"Could not log registration activity: {str(e)}")
+            user_id = auth_data["user"]["id"]
+            if isinstance(user_id, str):
+                user_id = uuid.UUID(user_id)
+
+            background.add_task(
+                _log_activity_background,
+                user_id=user_id,
+                action_type=ActivityActionType.USER_REGISTERED,
+                entity_type="user",
+                entity_id=user_id,
+                entity_name=request.full_name or request.email,
+                description="Welcome! Your account has been created"
+            )
         
-        logger.info(f"User registration completed successfully: {request.email}")
+        logger.info("User registration completed successfully: %s", request.email)
         return AuthResponse(**auth_data)
         
     except Exception as e:
         # Log failed registration with both standard logger and event logger
-        logger.error(f"User registration failed for {request.email}: {str(e)}")
+        logger.error("User registration failed for %s: %s", request.email, str(e))
         AuthEventLogger.log_registration_attempt(request.email, success=False, error=str(e))
         raise
 
@@ -97,7 +97,7 @@ async def sign_up(
 @router.post("/signin", response_model=AuthResponse)
 async def sign_in(
     request: SignInRequest,
-    session: AsyncSession = Depends(get_session)
+    background: BackgroundTasks
 ):
     """
     Sign in an existing user with email and password.
@@ -107,7 +107,7 @@ async def sign_in(
     
     Returns access and refresh tokens on successful authentication.
     """
-    logger.info(f"Sign in request for email: {request.email}")
+    logger.info("Sign in request for email: %s", request.email)
     
     try:
         # Use business logic helper for sign in
@@ -119,41 +119,28 @@ async def sign_in(
         # Log successful sign in
         AuthEventLogger.log_sign_in_attempt(request.email, success=True)
         
-        # Log activity to database (only if user exists in local DB)
+        # Log activity to database after the response is sent
         if auth_data.get("user") and auth_data["user"].get("id"):
-            try:
-                user_id = auth_data["user"]["id"]
-                if isinstance(user_id, str):
-                    user_id = uuid.UUID(user_id)
-                
-                # First check if user exists in local database
-                from sqlmodel import select
-                from app.models.database import User
-                stmt = select(User).where(User.id == user_id)
-                result = await session.execute(stmt)
-                local_user = result.scalar_one_or_none()
-                
-                # Only log activity if user exists in local database
-                if local_user:
-                    activity_repo = ActivityRepository(session)
-                    await activity_repo.create(
-                        user_id=user_id,
-                        action_type=ActivityActionType.USER_SIGNED_IN,
-                        entity_type="user",
-                        entity_id=user_id,
-                        entity_name=request.email,
-                        description="Successfully logged in"
-                    )
-            except Exception as e:
-                # Log the error but don't fail the sign in
-                logger.warning(f"Could not log sign in activity: {str(e)}")
+            user_id = auth_data["user"]["id"]
+            if isinstance(user_id, str):
+                user_id = uuid.UUID(user_id)
+
+            background.add_task(
+                _log_activity_background,
+                user_id=user_id,
+                action_type=ActivityActionType.USER_SIGNED_IN,
+                entity_type="user",
+                entity_id=user_id,
+                entity_name=request.email,
+                description="Successfully logged in"
+            )
         
-        logger.info(f"User sign in completed successfully: {request.email}")
+        logger.info("User sign in completed successfully: %s", request.email)
         return AuthResponse(**auth_data)
         
     except Exception as e:
         # Log failed sign in with both standard logger and event logger
-        logger.error(f"User sign in failed for {request.email}: {str(e)}")
+        logger.error("User sign in failed for %s: %s", request.email, str(e))
         AuthEventLogger.log_sign_in_attempt(request.email, success=False, error=str(e))
         raise
 
@@ -168,10 +155,16 @@ async def refresh_token(request: RefreshTokenRequest):
     Returns new access and refresh tokens.
     """
     logger.info("Token refresh request received")
-    
+
+    # Reject obviously malformed tokens locally before paying the
+    # Supabase round-trip (bot/scanner traffic mostly sends garbage)
+    token = request.refresh_token
+    if not token or not token.strip() or any(c.isspace() for c in token):
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
     try:
         # Use business logic helper for token refresh
-        token_data = await AuthBusinessLogic.handle_token_refresh(request.refresh_token)
+        token_data = await AuthBusinessLogic.handle_token_refresh(token)
         
         # Log successful token refresh
         AuthEventLogger.log_token_refresh_attempt(success=True)
@@ -181,31 +174,31 @@ async def refresh_token(request: RefreshTokenRequest):
         
     except Exception as e:
         # Log failed token refresh with both standard logger and event logger
-        logger.error(f"Token refresh failed: {str(e)}")
+        logger.error("Token refresh failed: %s", str(e))
         AuthEventLogger.log_token_refresh_attempt(success=False, error=str(e))
         raise
 
 
 @router.post("/signout", response_model=MessageResponse)
 async def sign_out(
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
+    background: BackgroundTasks,
+    current_user: User = CurrentUser
 ):
     """
     Sign out the current authenticated user.
-    
+
     Invalidates the current session and tokens.
     """
-    logger.info(f"Sign out request for user: {current_user.email}")
-    
+    logger.info("Sign out request for user: %s", current_user.email)
+
     try:
         # Use business logic helper for sign out
         success = await AuthBusinessLogic.handle_user_sign_out("")
-        
+
         if success:
-            # Log activity to database
-            activity_repo = ActivityRepository(session)
-            await activity_repo.create(
+            # Log activity to database after the response is sent
+            background.add_task(
+                _log_activity_background,
                 user_id=current_user.id,
                 action_type=ActivityActionType.USER_SIGNED_OUT,
                 entity_type="user",
@@ -213,21 +206,21 @@ async def sign_out(
                 entity_name=current_user.full_name or current_user.email,
                 description="Successfully logged out"
             )
-            
-            logger.info(f"User signed out successfully: {current_user.email}")
+
+            logger.info("User signed out successfully: %s", current_user.email)
             return MessageResponse(
                 message=f"Successfully signed out user {current_user.email}",
                 success=True
             )
         else:
-            logger.warning(f"Sign out failed for user: {current_user.email}")
+            logger.warning("Sign out failed for user: %s", current_user.email)
             return MessageResponse(
                 message="Sign out failed",
                 success=False
             )
             
     except Exception as e:
-        logger.error(f"Sign out error for user {current_user.email}: {str(e)}")
+        logger.error("Sign out error for user %s: %s", current_user.email, str(e))
         raise
 
 
@@ -238,12 +231,12 @@ async def get_current_user_info(current_user: User = CurrentUser):
     
     Returns the authenticated user's profile data.
     """
-    logger.info(f"User info request for user: {current_user.email}")
+    logger.info("User info request for user: %s", current_user.email)
     
     # Use response formatter for consistent user data
     user_data = AuthResponseFormatter.format_user_response(current_user)
     
-    logger.info(f"User info retrieved successfully: {current_user.email}")
+    logger.info("User info retrieved successfully: %s", current_user.email)
     return UserResponse(**user_data)
 
 
@@ -3,6 +3,7 @@ Category management endpoints using clean architecture.
 CRUD operations for task categories with proper separation of concerns.
 """
 from fastapi import APIRouter, status, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 import uuid
 import logging
@@ -22,7 +23,7 @@ from app.utils.category_helpers import (
     CategoryPermissionChecker
 )
 from app.core.auth import CurrentUser
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
 from app.models.database import User
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -33,7 +34,7 @@ router = APIRouter()
 @router.get("/", response_model=CategoryListResponse)
 async def list_categories(
     current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get all categories from all projects the user has access to.
@@ -42,38 +43,40 @@ async def list_categories(
     """
     logger.info(f"Retrieving all categories for user {current_user.id}")
     
-    # Get categories from all user's projects
-    from app.models.database import Category, Project, ProjectMember
-    from sqlmodel import select, or_
-    
+    # Get categories from all user's projects with task counts in the same
+    # grouped query - one round-trip for the whole listing
+    from app.models.database import Category, Project, ProjectMember, Task
+    from sqlmodel import select, or_, and_, func, distinct
+
     stmt = (
-        select(Category).distinct()
+        select(Category, func.count(distinct(Task.id)).label("task_count"))
         .join(Project, Project.id == Category.project_id)
         .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
+        .outerjoin(Task, and_(Task.category_id == Category.id, Task.is_deleted == False))
         .where(
             or_(
                 Project.owner_id == current_user.id,
                 ProjectMember.user_id == current_user.id
             )
         )
+        .group_by(Category.id)
         .order_by(Category.position, Category.name)
     )
-    
+
     result = await session.execute(stmt)
-    categories = result.scalars().all()
-    
-    # Build response with task counts
-    category_responses = []
-    for category in categories:
-        task_count = await CategoryQueryHelper.get_task_count_for_category(category.id, session)
-        category_responses.append(CategoryResponse.from_category(category, task_count))
-    
+    category_responses = [
+        CategoryResponse.from_category(category, task_count)
+        for category, task_count in result.all()
+    ]
+
     logger.info(f"Found {len(category_responses)} categories for user {current_user.id}")
-    return CategoryListResponse(
+    # Returning a Response directly skips FastAPI's response-model
+    # re-validation; pydantic-core dumps the models, orjson serializes
+    return ORJSONResponse(CategoryListResponse(
         categories=category_responses,
         total=len(category_responses),
         has_tasks=len([c for c in category_responses if c.task_count > 0])
-    )
+    ).model_dump(mode="json"))
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -108,19 +111,17 @@ async def create_category(
     
     # Log the creation event
     await CategoryEventLogger.log_category_created(category, current_user.id, session)
-    
-    # Get task count (will be 0 for new category)
-    task_count = await CategoryQueryHelper.get_task_count_for_category(category.id, session)
-    
+
     logger.info(f"Category created successfully: {category.id}")
-    return CategoryResponse.from_category(category, task_count)
+    # A brand-new category has no tasks - skip the count query
+    return CategoryResponse.from_category(category, 0)
 
 
 @router.get("/project/{project_id}", response_model=CategoryListResponse)
 async def get_project_categories(
     project_id: uuid.UUID,
     current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get all categories for a project with task counts.
@@ -137,28 +138,29 @@ async def get_project_categories(
         session=session
     )
     
-    # Build response with task counts
-    category_responses = []
-    categories_with_tasks = 0
-    
-    for category in categories:
-        task_count = await CategoryQueryHelper.get_task_count_for_category(category.id, session)
-        category_responses.append(CategoryResponse.from_category(category, task_count))
-        if task_count > 0:
-            categories_with_tasks += 1
-    
+    # Build response with task counts fetched in one grouped query
+    task_counts = await CategoryQueryHelper.get_task_counts_for_categories(
+        [c.id for c in categories], session
+    )
+    category_responses = [
+        CategoryResponse.from_category(category, task_counts.get(category.id, 0))
+        for category in categories
+    ]
+    categories_with_tasks = sum(1 for c in category_responses if c.task_count > 0)
+
     logger.info(f"Retrieved {len(category_responses)} categories for project {project_id}")
-    return CategoryListResponse(
+    # Same fast path as list_categories: dump once, serialize with orjson
+    return ORJSONResponse(CategoryListResponse(
         categories=category_responses,
         total=len(category_responses),
         has_tasks=categories_with_tasks
-    )
+    ).model_dump(mode="json"))
 
 
 @router.get("/stats", response_model=CategoryStatsResponse)
 async def get_category_stats(
     current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get comprehensive category statistics for user's projects.
@@ -185,7 +187,7 @@ async def get_category_stats(
 async def get_category(
     category_id: uuid.UUID,
     current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get a specific category by ID with task count.
@@ -228,12 +230,10 @@ async def update_category(
     
     if not update_data:
         logger.warning(f"No update fields provided for category {category_id}")
-        # Still return current category info
-        category = await CategoryPermissionChecker.check_category_access(
-            category_id, current_user.id, session
-        )
-        task_count = await CategoryQueryHelper.get_task_count_for_category(category.id, session)
-        return CategoryResponse.from_category(category, task_count)
+        # Nothing changed - short-circuit with 304 instead of spending two
+        # roundtrips (category fetch + task count) to echo current state
+        from fastapi import HTTPException
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED)
     
     # Use business logic helper for update
     category = await CategoryBusinessLogic.update_category(
@@ -1,183 +1,273 @@
-"""
-Endpoints to manage project members: list, add, update role, remove.
-Only project owners can mutate. Members can list.
-"""
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, and_, or_
-import uuid
-
-from app.core.database import get_session
-from app.core.auth import CurrentUser
-from app.models.database import User, Project, ProjectMember
-from app.schemas.project_member import (
-    ProjectMemberCreate,
-    ProjectMemberUpdate,
-    ProjectMemberResponse,
-    ProjectMemberListResponse,
-    UserBasicInfo,
-)
-from app.utils.task_helpers import TaskPermissionChecker
-
-router = APIRouter()
-
-
-def ensure_owner(project: Project, user_id: uuid.UUID):
-    if project.owner_id != user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project owner can perform this action")
-
-
-def map_member(pm: ProjectMember, user: User = None) -> ProjectMemberResponse:
-    user_info = None
-    if user:
-        user_info = UserBasicInfo(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            full_name=user.full_name
-        )
-    return ProjectMemberResponse(
-        id=pm.id, 
-        project_id=pm.project_id, 
-        user_id=pm.user_id, 
-        role=str(pm.role),
-        user=user_info
-    )
-
-
-@router.get("/{project_id}/members", response_model=ProjectMemberListResponse)
-async def list_members(
-    project_id: uuid.UUID,
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    # Access check (owner or member)
-    await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
-    
-    # Fetch members with user details using join
-    from sqlmodel import select
-    stmt = (
-        select(ProjectMember, User)
-        .join(User, User.id == ProjectMember.user_id)
-        .where(ProjectMember.project_id == project_id)
-    )
-    res = await session.execute(stmt)
-    members_with_users = res.all()
-    
-    # Map members with user details
-    member_responses = []
-    for pm, user in members_with_users:
-        member_responses.append(map_member(pm, user))
-    
-    return ProjectMemberListResponse(members=member_responses, total=len(member_responses))
-
-
-@router.post("/{project_id}/members", response_model=ProjectMemberResponse, status_code=status.HTTP_201_CREATED)
-async def add_member(
-    project_id: uuid.UUID,
-    payload: ProjectMemberCreate,
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    # Owner-only
-    project = await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
-    ensure_owner(project, current_user.id)
-
-    # Prevent duplicates
-    exists = (
-        await session.execute(
-            select(ProjectMember).where(and_(ProjectMember.project_id == project_id, ProjectMember.user_id == payload.user_id))
-        )
-    ).scalar_one_or_none()
-    if exists:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User already a member")
-
-    # Get the user details for the response
-    user_res = await session.execute(select(User).where(User.id == payload.user_id))
-    user = user_res.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
-    pm = ProjectMember(project_id=project_id, user_id=payload.user_id, role=payload.role)
-    session.add(pm)
-    await session.commit()
-    await session.refresh(pm)
-
-    # Create activity
-    from app.repositories.activity_repository import ActivityRepository
-    from app.models.database import ActivityActionType
-    activity_repo = ActivityRepository(session)
-    await activity_repo.create(
-        user_id=current_user.id,
-        action_type=ActivityActionType.PROJECT_MEMBER_ADDED,
-        entity_type="project",
-        entity_id=project_id,
-        entity_name=project.name,
-        target_user_id=payload.user_id,
-        description=f"Added {user.full_name or user.email} as a team member to \"{project.name}\"",
-        project_id=project_id
-    )
-
-    return map_member(pm, user)
-
-
-@router.put("/{project_id}/members/{member_id}", response_model=ProjectMemberResponse)
-async def update_member_role(
-    project_id: uuid.UUID,
-    member_id: uuid.UUID,
-    payload: ProjectMemberUpdate,
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    project = await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
-    ensure_owner(project, current_user.id)
-    pm = (
-        await session.execute(select(ProjectMember).where(and_(ProjectMember.id == member_id, ProjectMember.project_id == project_id)))
-    ).scalar_one_or_none()
-    if not pm:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
-    pm.role = payload.role
-    await session.commit()
-    await session.refresh(pm)
-    return map_member(pm)
-
-
-@router.delete("/{project_id}/members/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_member(
-    project_id: uuid.UUID,
-    member_id: uuid.UUID,
-    current_user: User = CurrentUser,
-    session: AsyncSession = Depends(get_session)
-):
-    project = await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
-    ensure_owner(project, current_user.id)
-    pm = (
-        await session.execute(select(ProjectMember).where(and_(ProjectMember.id == member_id, ProjectMember.project_id == project_id)))
-    ).scalar_one_or_none()
-    if not pm:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
-
-    # Create activity before deleting
-    from app.repositories.activity_repository import ActivityRepository
-    from app.models.database import ActivityActionType
-    activity_repo = ActivityRepository(session)
-    # Need to get user info for the description
-    user_to_remove_res = await session.execute(select(User).where(User.id == pm.user_id))
-    user_to_remove = user_to_remove_res.scalar_one_or_none()
-    
-    await activity_repo.create(
-        user_id=current_user.id,
-        action_type=ActivityActionType.PROJECT_MEMBER_REMOVED,
-        entity_type="project",
-        entity_id=project_id,
-        entity_name=project.name,
-        target_user_id=pm.user_id,
-        description=f"Removed {user_to_remove.full_name or user_to_remove.email} from \"{project.name}\"",
-        project_id=project_id
-    )
-
-    await session.delete(pm)
-    await session.commit()
-    return
-
-
+"""
+Endpoints to manage project members: list, add, update role, remove.
+Only project owners can mutate. Members can list.
+"""
+from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, and_, or_
+import uuid
+
+from app.core.database import get_session, get_read_session
+from app.core.auth import CurrentUser
+from app.exceptions.base import PermissionDeniedError
+from app.models.database import User, Project, ProjectMember
+from app.schemas.project_member import (
+    ProjectMemberCreate,
+    ProjectMemberUpdate,
+    ProjectMemberResponse,
+    ProjectMemberListResponse,
+    UserBasicInfo,
+)
+from app.utils.task_helpers import TaskPermissionChecker
+
+router = APIRouter()
+
+
+async def get_project_with_access(
+    project_id: uuid.UUID,
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_session),
+) -> Project:
+    """Resolve the project with an access check, once per request.
+
+    FastAPI caches dependency results within a request, so every consumer
+    shares a single Project lookup instead of re-fetching the row.
+    """
+    return await TaskPermissionChecker.check_project_access(
+        project_id, current_user.id, session
+    )
+
+
+def ensure_owner(project: Project, user_id: uuid.UUID):
+    if project.owner_id != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project owner can perform this action")
+
+
+async def ensure_owner_or_hide(
+    project: Project, user_id: uuid.UUID, session: AsyncSession
+) -> None:
+    """Owner check that doesn't leak member existence to outsiders.
+
+    Used by the single-query endpoints that fetch the member row before
+    any access check: a requester who is neither owner nor member gets
+    the same 404 a missing member produces, so (project_id, member_id)
+    pairs can't be probed. 403 is reserved for actual members, who can
+    already see the roster. Owners - the expected callers - pay no extra
+    query.
+    """
+    if project.owner_id == user_id:
+        return
+    is_member = await session.scalar(
+        select(ProjectMember.id)
+        .where(
+            and_(
+                ProjectMember.project_id == project.id,
+                ProjectMember.user_id == user_id,
+            )
+        )
+        .limit(1)
+    )
+    if is_member is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project owner can perform this action")
+
+
+def map_member(pm: ProjectMember, user: User = None) -> ProjectMemberResponse:
+    user_info = None
+    if user:
+        user_info = UserBasicInfo(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name
+        )
+    return ProjectMemberResponse(
+        id=pm.id, 
+        project_id=pm.project_id, 
+        user_id=pm.user_id, 
+        role=str(pm.role),
+        user=user_info
+    )
+
+
+@router.get("/{project_id}/members", response_model=ProjectMemberListResponse)
+async def list_members(
+    project_id: uuid.UUID,
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_read_session),
+    project: Project = Depends(get_project_with_access)
+):
+    # Fetch members with user details using join
+    from sqlmodel import select
+    stmt = (
+        select(ProjectMember, User)
+        .join(User, User.id == ProjectMember.user_id)
+        .where(ProjectMember.project_id == project_id)
+    )
+    # Stream rows as the driver produces them instead of materializing the
+    # whole joined result first - memory stays flat for 1000+ member teams.
+    # Each row becomes a plain dict handed straight to orjson; building
+    # Pydantic models per row would double the allocations.
+    members = []
+    result = await session.stream(stmt)
+    async for pm, user in result:
+        members.append({
+            "id": str(pm.id),
+            "project_id": str(pm.project_id),
+            "user_id": str(pm.user_id),
+            "role": str(pm.role),
+            "user": {
+                "id": str(user.id),
+                "email": user.email,
+                "username": user.username,
+                "full_name": user.full_name,
+            },
+        })
+    return ORJSONResponse({"members": members, "total": len(members)})
+
+
+@router.post("/{project_id}/members", response_model=ProjectMemberResponse, status_code=status.HTTP_201_CREATED)
+async def add_member(
+    project_id: uuid.UUID,
+    payload: ProjectMemberCreate,
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_session),
+    project: Project = Depends(get_project_with_access)
+):
+    # Owner-only
+    ensure_owner(project, current_user.id)
+
+    # The user row is still needed for the response and the activity text
+    user = (
+        await session.execute(select(User).where(User.id == payload.user_id))
+    ).scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    # Let the unique (project_id, user_id) constraint enforce membership
+    # atomically: no pre-check SELECT and no race window between a check
+    # and the INSERT - a conflict simply returns no row
+    pm = ProjectMember(project_id=project_id, user_id=payload.user_id, role=payload.role)
+    insert_stmt = (
+        pg_insert(ProjectMember)
+        .values(
+            id=pm.id,
+            project_id=pm.project_id,
+            user_id=pm.user_id,
+            role=pm.role,
+            added_at=pm.added_at,
+        )
+        .on_conflict_do_nothing(index_elements=["project_id", "user_id"])
+        .returning(ProjectMember.id)
+    )
+    inserted_id = (await session.execute(insert_stmt)).scalar_one_or_none()
+    if inserted_id is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User already a member")
+    await session.commit()
+
+    # Create activity
+    from app.repositories.activity_repository import ActivityRepository
+    from app.models.database import ActivityActionType
+    activity_repo = ActivityRepository(session)
+    await activity_repo.create(
+        user_id=current_user.id,
+        action_type=ActivityActionType.PROJECT_MEMBER_ADDED,
+        entity_type="project",
+        entity_id=project_id,
+        entity_name=project.name,
+        target_user_id=payload.user_id,
+        description=f"Added {user.full_name or user.email} as a team member to \"{project.name}\"",
+        project_id=project_id
+    )
+
+    return map_member(pm, user)
+
+
+@router.put("/{project_id}/members/{member_id}", response_model=ProjectMemberResponse)
+async def update_member_role(
+    project_id: uuid.UUID,
+    member_id: uuid.UUID,
+    payload: ProjectMemberUpdate,
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_session)
+):
+    # Single query: member row and its project arrive together, so the
+    # ownership check needs no separate access-check round-trip
+    row = (
+        await session.execute(
+            select(ProjectMember, Project)
+            .join(Project, Project.id == ProjectMember.project_id)
+            .where(and_(ProjectMember.id == member_id, ProjectMember.project_id == project_id))
+        )
+    ).first()
+    if row is None:
+        # Error path only: distinguish a missing member from a missing
+        # project. An inaccessible project must *not* be distinguishable:
+        # outsiders get the same 404 ensure_owner_or_hide produces when
+        # the member row exists, so the two cases can't be told apart.
+        try:
+            await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
+        except PermissionDeniedError:
+            pass
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
+    pm, project = row
+    await ensure_owner_or_hide(project, current_user.id, session)
+    pm.role = payload.role
+    await session.commit()
+    await session.refresh(pm)
+    return map_member(pm)
+
+
+@router.delete("/{project_id}/members/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_member(
+    project_id: uuid.UUID,
+    member_id: uuid.UUID,
+    current_user: User = CurrentUser,
+    session: AsyncSession = Depends(get_session)
+):
+    # Single query: member, project and the member's user row together,
+    # replacing the access check + member fetch + user fetch round-trips
+    row = (
+        await session.execute(
+            select(ProjectMember, Project, User)
+            .join(Project, Project.id == ProjectMember.project_id)
+            .join(User, User.id == ProjectMember.user_id)
+            .where(and_(ProjectMember.id == member_id, ProjectMember.project_id == project_id))
+        )
+    ).first()
+    if row is None:
+        # Error path only: distinguish a missing member from a missing
+        # project. An inaccessible project must *not* be distinguishable:
+        # outsiders get the same 404 ensure_owner_or_hide produces when
+        # the member row exists, so the two cases can't be told apart.
+        try:
+            await TaskPermissionChecker.check_project_access(project_id, current_user.id, session)
+        except PermissionDeniedError:
+            pass
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
+    pm, project, user_to_remove = row
+    await ensure_owner_or_hide(project, current_user.id, session)
+
+    # Create activity before deleting
+    from app.repositories.activity_repository import ActivityRepository
+    from app.models.database import ActivityActionType
+    activity_repo = ActivityRepository(session)
+
+    await activity_repo.create(
+        user_id=current_user.id,
+        action_type=ActivityActionType.PROJECT_MEMBER_REMOVED,
+        entity_type="project",
+        entity_id=project_id,
+        entity_name=project.name,
+        target_user_id=pm.user_id,
+        description=f"Removed {user_to_remove.full_name or user_to_remove.email} from \"{project.name}\"",
+        project_id=project_id
+    )
+
+    await session.delete(pm)
+    await session.commit()
+    return
+
+
@@ -2,8 +2,15 @@
 Task management endpoints using clean architecture.
 CRUD operations for individual tasks with proper separation of concerns.
 """
-from fastapi import APIRouter, status, Depends, Query, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Request, Response, status, Depends, Query, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+# Imported directly because list_tasks' `status` query parameter shadows
+# the fastapi.status module inside that function body
+from starlette.status import HTTP_304_NOT_MODIFIED
+import hashlib
+import orjson
 from typing import Optional, List
+from functools import lru_cache
 import uuid
 import logging
 from datetime import datetime
@@ -23,6 +30,7 @@ from app.utils.task_helpers import (
     TaskAnalyzer
 )
 from app.core.auth import CurrentUser
+from app.infrastructure.cache import cache_manager
 from app.core.database import get_session
 from app.repositories.task_repository import TaskRepository
 from app.repositories.activity_repository import ActivityRepository
@@ -39,9 +47,26 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+@lru_cache(maxsize=1024)
+def _safe_uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse a query-param UUID, treating blanks and garbage as None.
+
+    Defined once at module level (not rebuilt per request) and memoized:
+    clients tend to poll with the same project/assignee filters, so
+    repeat parses become dict hits.
+    """
+    if not value or value.strip() == "":
+        return None
+    try:
+        return uuid.UUID(value.strip())
+    except ValueError:
+        return None
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     request: TaskCreateRequest,
+    background: BackgroundTasks,
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
 ):
@@ -101,17 +126,51 @@ async def create_task(
         project_id=created_task.project_id
     )
     
-    # Use broadcaster for events
-    await TaskEventBroadcaster.broadcast_task_event(
+    # WebSocket fanout happens after the response is sent; the task's
+    # columns are already loaded (expire_on_commit=False) so the detached
+    # instance is safe to read in the background
+    background.add_task(
+        TaskEventBroadcaster.broadcast_task_event,
         "task_created", created_task, current_user.id
     )
+
+    # Stats caches for this user are stale now
+    await cache_manager.invalidate_user_cache(str(current_user.id))
     
     logger.info(f"Task created successfully: {created_task.id}")
     return TaskResponse.from_task(created_task)
 
 
+def _stream_tasks(
+    user_id: uuid.UUID,
+    project_uuid: Optional[uuid.UUID],
+    filters: dict,
+) -> StreamingResponse:
+    """NDJSON variant of the task listing: one task object per line.
+
+    The generator owns its session (the request-scoped one may be closed
+    before a StreamingResponse body is iterated) and rows flow through a
+    server-side cursor, so memory stays constant however large the page
+    is and the first byte leaves before the last row is read.
+    """
+    from app.core.database import async_session_maker
+
+    async def gen():
+        async with async_session_maker() as stream_session:
+            repo = TaskRepository(stream_session)
+            async for task in repo.iter_with_filters(
+                user_id=user_id, project_id=project_uuid, filters=filters
+            ):
+                yield orjson.dumps(
+                    TaskResponse.from_task_fast(task).model_dump(mode="json")
+                ) + b"\n"
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+
 @router.get("/", response_model=TaskListResponse)
 async def list_tasks(
+    request: Request,
     project_id: Optional[str] = Query(None, description="Filter by project"),
     status: Optional[TaskStatus] = Query(None, description="Filter by status"),
     priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
@@ -120,6 +179,7 @@ async def list_tasks(
     limit: int = Query(50, ge=1, le=100, description="Results per page"),
     per_page: Optional[int] = Query(None, ge=1, le=100, description="Results per page (alias for limit)"),
     offset: int = Query(0, ge=0, description="Results offset"),
+    stream: bool = Query(False, description="Stream results as NDJSON (one task per line)"),
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
 ):
@@ -129,19 +189,10 @@ async def list_tasks(
     Returns paginated task list with filtering options.
     """
     logger.info(f"Listing tasks for user {current_user.id}")
-    
-    # Safely convert string UUIDs to UUID objects, handle empty strings
-    def safe_uuid_convert(value: Optional[str]) -> Optional[uuid.UUID]:
-        if not value or value.strip() == "":
-            return None
-        try:
-            return uuid.UUID(value.strip())
-        except ValueError:
-            return None
-    
-    project_uuid = safe_uuid_convert(project_id)
-    assignee_uuid = safe_uuid_convert(assignee_id)
-    category_uuid = safe_uuid_convert(category_id)
+
+    project_uuid = _safe_uuid(project_id)
+    assignee_uuid = _safe_uuid(assignee_id)
+    category_uuid = _safe_uuid(category_id)
     
     # Build search request - prioritize per_page over limit
     effective_limit = per_page if per_page is not None else limit
@@ -155,40 +206,73 @@ async def list_tasks(
         offset=offset
     )
     
-    # Get tasks through repository
     repo = TaskRepository(session)
+    filters = search_request.dict(exclude_unset=True)
+
+    if stream:
+        return _stream_tasks(current_user.id, project_uuid, filters)
+
+    # Cheap aggregate fingerprint first: SPAs poll this endpoint, and
+    # until something mutates the filtered set the ETag matches and we
+    # skip the full SELECT, hydration and serialization entirely
+    max_updated, fp_count = await repo.list_fingerprint(
+        user_id=current_user.id, project_id=project_uuid, filters=filters
+    )
+    etag = hashlib.blake2b(
+        f"{max_updated}:{fp_count}:{effective_limit}:{offset}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Get tasks through repository
     tasks, total = await repo.list_with_filters(
         user_id=current_user.id,
         project_id=project_uuid,
-        filters=search_request.dict(exclude_unset=True)
+        filters=filters
     )
-    
-    # Build response
-    task_responses = [TaskResponse.from_task(task) for task in tasks]
-    
+
+    # Build response - rows are trusted, so skip re-validation and let
+    # orjson serialize the page instead of response_model round-tripping it
+    task_responses = [TaskResponse.from_task_fast(task) for task in tasks]
+
     logger.info(f"Listed {len(task_responses)}/{total} tasks for user {current_user.id}")
-    return TaskListResponse(
-        tasks=task_responses,
-        total=total,
-        limit=effective_limit,
-        offset=offset,
-        has_more=offset + len(task_responses) < total
+    return ORJSONResponse(
+        TaskListResponse.model_construct(
+            tasks=task_responses,
+            total=total,
+            limit=effective_limit,
+            offset=offset,
+            has_more=offset + len(task_responses) < total,
+            filters_applied={},
+            sort_by=None,
+            sort_order="asc",
+        ).model_dump(mode="json"),
+        headers={"ETag": etag},
     )
 
 
 @router.get("/search", response_model=TaskListResponse)
 async def search_tasks(
     request: TaskSearchRequest = Depends(),
+    stream: bool = Query(False, description="Stream results as NDJSON (one task per line)"),
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
 ):
     """
     Advanced task search with multiple criteria.
-    
+
     Supports full-text search, status/priority filtering, date ranges, and more.
     """
     logger.info(f"Searching tasks for user {current_user.id} with query: {request.query}")
-    
+
+    if stream:
+        return _stream_tasks(
+            current_user.id,
+            request.project_id,
+            request.dict(exclude_unset=True),
+        )
+
     # Use repository for advanced search
     repo = TaskRepository(session)
     tasks, total = await repo.search(
@@ -196,19 +280,22 @@ async def search_tasks(
         search_params=request.dict(exclude_unset=True)
     )
     
-    # Build response
-    task_responses = [TaskResponse.from_task(task) for task in tasks]
-    
+    # Build response - same fast path as list_tasks: constructed models,
+    # orjson on the way out
+    task_responses = [TaskResponse.from_task_fast(task) for task in tasks]
+
     logger.info(f"Found {len(task_responses)}/{total} tasks for search query")
-    return TaskListResponse(
-        tasks=task_responses,
-        total=total,
-        limit=request.limit,
-        offset=request.offset,
-        has_more=request.offset + len(task_responses) < total,
-        filters_applied=request.dict(exclude_unset=True),
-        sort_by=request.sort_by,
-        sort_order=request.sort_order
+    return ORJSONResponse(
+        TaskListResponse.model_construct(
+            tasks=task_responses,
+            total=total,
+            limit=request.limit,
+            offset=request.offset,
+            has_more=request.offset + len(task_responses) < total,
+            filters_applied=request.dict(exclude_unset=True),
+            sort_by=request.sort_by,
+            sort_order=request.sort_order
+        ).model_dump(mode="json")
     )
 
 
@@ -224,32 +311,45 @@ async def get_task_stats(
     Returns task counts, completion metrics, and analytics.
     """
     logger.info(f"Getting task stats for user {current_user.id}")
-    
-    # Use analyzer for statistics
-    raw_stats = await TaskAnalyzer.get_user_task_statistics(
-        user_id=current_user.id,
-        project_id=project_id,
-        session=session
+
+    # Short-TTL cache: every SPA render hits this endpoint, and 15 stale
+    # seconds are invisible next to skipping the aggregate scan. Task
+    # mutations invalidate the user's entries eagerly anyway.
+    # get_or_load single-flights concurrent misses, so a burst of renders
+    # runs the aggregate query once instead of once per request.
+    project_key = str(project_id) if project_id else None
+
+    async def _load_stats() -> dict:
+        raw_stats = await TaskAnalyzer.get_user_task_statistics(
+            user_id=current_user.id,
+            project_id=project_id,
+            session=session
+        )
+
+        # Map analyzer keys to response schema to avoid 422 validation errors
+        return {
+            "total": raw_stats.get("total_tasks", 0),
+            "completed": raw_stats.get("completed_count", 0),
+            "in_progress": raw_stats.get("in_progress_count", 0),
+            "todo": raw_stats.get("todo_count", 0),
+            "overdue": raw_stats.get("overdue_count", 0),
+            "priority_breakdown": {},
+            # Backend analyzer returns percentage (0-100). Response expects 0-1.
+            "completion_rate": (raw_stats.get("completion_rate", 0.0) / 100.0) if raw_stats.get("completion_rate") else 0.0,
+            "average_completion_time": None,
+            "created_today": 0,
+            "completed_today": 0,
+            "due_this_week": 0,
+        }
+
+    mapped = await cache_manager.get_or_load(
+        cache_manager._task_stats_key(str(current_user.id), project_key),
+        _load_stats,
+        ttl_seconds=15,
     )
 
-    # Map analyzer keys to response schema to avoid 422 validation errors
-    mapped = {
-        "total": raw_stats.get("total_tasks", 0),
-        "completed": raw_stats.get("completed_count", 0),
-        "in_progress": raw_stats.get("in_progress_count", 0),
-        "todo": raw_stats.get("todo_count", 0),
-        "overdue": raw_stats.get("overdue_count", 0),
-        "priority_breakdown": {},
-        # Backend analyzer returns percentage (0-100). Response expects 0-1.
-        "completion_rate": (raw_stats.get("completion_rate", 0.0) / 100.0) if raw_stats.get("completion_rate") else 0.0,
-        "average_completion_time": None,
-        "created_today": 0,
-        "completed_today": 0,
-        "due_this_week": 0,
-    }
-    
     logger.info(f"Task stats retrieved for user {current_user.id}")
-    return TaskStatsResponse(**mapped)
+    return TaskStatsResponse.model_construct(**mapped)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -280,6 +380,7 @@ async def get_task(
 async def update_task(
     task_id: uuid.UUID,
     request: TaskUpdateRequest,
+    background: BackgroundTasks,
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
 ):
@@ -291,34 +392,31 @@ async def update_task(
     """
     logger.info(f"Updating task {task_id}")
     
-    # Check access
-    await TaskPermissionChecker.check_task_access(
+    # Check access - the returned task doubles as the "current state"
+    # snapshot below, saving a second fetch of the same row
+    current_task = await TaskPermissionChecker.check_task_access(
         task_id=task_id,
         user_id=current_user.id,
         session=session,
         require_ownership=True
     )
-    
+
     # Get update data
     update_data = request.dict(exclude_unset=True)
-    
+
     if not update_data:
         logger.warning(f"No update fields provided for task {task_id}")
         # Still return current task
-        repo = TaskRepository(session)
-        task = await repo.get_by_id(task_id, current_user.id)
-        return TaskResponse.from_task(task)
-    
+        return TaskResponse.from_task(current_task)
+
     # Validate dates if being updated
     if 'start_date' in update_data or 'due_date' in update_data:
         TaskValidator.validate_task_dates(
             update_data.get('start_date'),
             update_data.get('due_date')
         )
-    
-    # Get current task for validation
+
     repo = TaskRepository(session)
-    current_task = await repo.get_by_id(task_id, current_user.id)
 
     # Validate completion if being updated
     if 'completed' in update_data:
@@ -446,11 +544,15 @@ async def update_task(
             project_id=updated_task.project_id
         )
     
-    # Broadcast update event
-    await TaskEventBroadcaster.broadcast_task_event(
+    # Broadcast update event after the response is sent
+    background.add_task(
+        TaskEventBroadcaster.broadcast_task_event,
         "task_updated", updated_task, current_user.id
     )
-    
+
+    # Stats caches for this user are stale now
+    await cache_manager.invalidate_user_cache(str(current_user.id))
+
     logger.info(f"Task updated successfully: {task_id}")
     return TaskResponse.from_task(updated_task)
 
@@ -458,6 +560,7 @@ async def update_task(
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: uuid.UUID,
+    background: BackgroundTasks,
     hard_delete: bool = Query(False, description="Permanently delete (true) or soft delete (false)"),
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
@@ -495,10 +598,14 @@ async def delete_task(
         project_id=task.project_id
     )
     
-    # Broadcast delete event
-    await TaskEventBroadcaster.broadcast_task_event(
+    # Broadcast delete event after the response is sent
+    background.add_task(
+        TaskEventBroadcaster.broadcast_task_event,
         "task_deleted", task, current_user.id
     )
+
+    # Stats caches for this user are stale now
+    await cache_manager.invalidate_user_cache(str(current_user.id))
     
     logger.info(f"Task deleted successfully: {task_id}")
 
@@ -506,6 +613,7 @@ async def delete_task(
 @router.post("/{task_id}/complete", response_model=TaskResponse)
 async def complete_task(
     task_id: uuid.UUID,
+    background: BackgroundTasks,
     completed: bool = Query(True, description="Mark as completed (true) or uncompleted (false)"),
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
@@ -549,11 +657,15 @@ async def complete_task(
         project_id=updated_task.project_id
     )
     
-    # Broadcast completion event
+    # Broadcast completion event after the response is sent
     event_type = "task_completed" if completed else "task_uncompleted"
-    await TaskEventBroadcaster.broadcast_task_event(
+    background.add_task(
+        TaskEventBroadcaster.broadcast_task_event,
         event_type, updated_task, current_user.id
     )
+
+    # Stats caches for this user are stale now
+    await cache_manager.invalidate_user_cache(str(current_user.id))
     
     logger.info(f"Task completion updated successfully: {task_id}")
     return TaskResponse.from_task(updated_task)
@@ -610,9 +722,21 @@ async def get_task_comments(
         require_ownership=False  # Allow read access to any task user can see
     )
     
-    # Get comments
+    # Project only the columns the response needs: no full TaskComment and
+    # User ORM objects per row, no identity-map bookkeeping, fewer bytes
+    # off the wire
     stmt = (
-        select(TaskComment, User)
+        select(
+            TaskComment.id,
+            TaskComment.content,
+            TaskComment.user_id,
+            TaskComment.created_at,
+            TaskComment.updated_at,
+            User.email,
+            User.username,
+            User.full_name,
+            User.avatar_url,
+        )
         .join(User, TaskComment.user_id == User.id)
         .where(
             TaskComment.task_id == task_id,
@@ -621,13 +745,26 @@ async def get_task_comments(
         )
         .order_by(TaskComment.created_at.asc())
     )
-    
+
     result = await session.execute(stmt)
-    comment_user_pairs = result.all()
-    
+
     comments = [
-        CommentResponse.from_comment(comment, user) 
-        for comment, user in comment_user_pairs
+        CommentResponse(
+            id=str(row.id),
+            content=row.content or "",
+            user_id=str(row.user_id),
+            user={
+                "id": str(row.user_id),
+                "email": row.email,
+                "username": row.username,
+                "full_name": row.full_name,
+                "avatar_url": row.avatar_url,
+            },
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            edited=row.updated_at is not None and row.updated_at > row.created_at,
+        )
+        for row in result.all()
     ]
     
     logger.info(f"Found {len(comments)} comments for task {task_id}")
@@ -665,8 +802,9 @@ async def add_task_comment(
     
     session.add(comment)
     await session.commit()
-    await session.refresh(comment)
-    
+    # No refresh: every column was set client-side and expire_on_commit
+    # is False, so the instance is already fully populated
+
     logger.info(f"Comment added successfully to task {task_id}")
     return CommentResponse.from_comment(comment, current_user)
 
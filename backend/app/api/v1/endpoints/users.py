@@ -1,11 +1,13 @@
 """
 Users endpoints for listing users that share projects with current user, and fetching user by id when visible.
 """
-from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import tuple_
 from sqlmodel import select, or_, and_
 import uuid
+from datetime import datetime
 from typing import List, Optional
 import os
 import aiofiles
@@ -13,7 +15,8 @@ from pathlib import Path
 import secrets
 
 from app.core.database import get_session
-from app.core.auth import CurrentUser
+from app.core.auth import CurrentUser, invalidate_cached_user
+from app.infrastructure.cache import cache_manager
 from app.models.database import User, Project, ProjectMember
 from app.schemas.user import PublicUser, UserListResponse
 from app.schemas.user_settings import (
@@ -41,20 +44,86 @@ def map_user(u: User) -> PublicUser:
 
 @router.get("/", response_model=UserListResponse)
 async def list_visible_users(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous page (next_cursor)"
+    ),
     current_user: User = CurrentUser,
     session: AsyncSession = Depends(get_session)
 ):
     """
-    List all active users in the system.
+    List active users in the system, newest first, keyset-paginated.
     This allows project owners to add any user to their projects.
+
+    Pass the `next_cursor` value from a previous response to fetch the
+    following page; a null `next_cursor` means the listing is exhausted.
     """
-    # Get all active users
-    stmt = select(User).where(User.is_active == True)
-    result = await session.execute(stmt)
-    all_users = result.scalars().all()
-    
-    users = [map_user(u) for u in all_users]
-    return UserListResponse(users=users, total=len(users))
+    # The visible-user directory changes rarely but is requested on every
+    # SPA render; a 15s cache keyed by page turns repeat hits into a dict
+    # lookup, and get_or_load collapses concurrent misses into one query.
+    # The payload is cached post-serialization so hits skip pydantic
+    # entirely.
+    async def _load_page() -> dict:
+        # Keyset pagination on (created_at, id): each page is a bounded
+        # index range scan regardless of how deep the client has paged,
+        # unlike OFFSET which re-reads every skipped row. Only the
+        # PublicUser columns are selected, so no full User ORM objects
+        # are hydrated.
+        stmt = (
+            select(
+                User.id,
+                User.email,
+                User.username,
+                User.full_name,
+                User.avatar_url,
+                User.is_active,
+                User.created_at,
+            )
+            .where(User.is_active == True)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit)
+        )
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = cursor.split("|", 1)
+                stmt = stmt.where(
+                    tuple_(User.created_at, User.id)
+                    < tuple_(datetime.fromisoformat(cursor_created_at), uuid.UUID(cursor_id))
+                )
+            except (ValueError, TypeError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+        rows = (await session.execute(stmt)).all()
+
+        # Rows come straight from the database - model_construct skips
+        # re-validating each field
+        users = [
+            PublicUser.model_construct(
+                id=row.id,
+                email=row.email,
+                username=row.username,
+                full_name=row.full_name,
+                avatar_url=row.avatar_url,
+                is_active=row.is_active,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = f"{last.created_at.isoformat()}|{last.id}"
+
+        return UserListResponse.model_construct(
+            users=users, total=len(users), next_cursor=next_cursor
+        ).model_dump(mode="json")
+
+    payload = await cache_manager.get_or_load(
+        f"users:visible:{limit}:{cursor or ''}", _load_page, ttl_seconds=15
+    )
+    return ORJSONResponse(payload)
 
 
 @router.get("/{user_id}", response_model=PublicUser)
@@ -69,22 +138,33 @@ async def get_user_if_visible(
     if user_id == current_user.id:
         return map_user(current_user)
 
-    # Check shared projects
-    shared_stmt = (
-        select(User)
-        .where(User.id == user_id)
-        .join(Project, or_(Project.owner_id == User.id))
-        .outerjoin(ProjectMember, ProjectMember.user_id == User.id)
-        .where(
-            or_(
-                # current_user is owner or member on project where target user participates
-                and_(Project.owner_id == current_user.id),
-                and_(ProjectMember.user_id == current_user.id),
+    # EXISTS semi-join: is there any project where both users participate
+    # (as owner or member)? The old multi-join version fanned out across
+    # memberships and its join condition missed the target-is-member case.
+    def _participates(uid: uuid.UUID):
+        return or_(
+            Project.owner_id == uid,
+            select(ProjectMember.id)
+            .where(
+                and_(
+                    ProjectMember.project_id == Project.id,
+                    ProjectMember.user_id == uid,
+                )
             )
+            .exists(),
         )
+
+    shared_exists = (
+        select(Project.id)
+        .where(and_(_participates(user_id), _participates(current_user.id)))
+        .exists()
     )
-    res = await session.execute(shared_stmt)
-    target = res.scalar_one_or_none()
+    visible = await session.scalar(select(shared_exists))
+    if not visible:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    # Cheap PK fetch (served from the identity map when already loaded)
+    target = await session.get(User, user_id)
     if not target:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return map_user(target)
@@ -135,7 +215,8 @@ async def upload_avatar(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
-    
+    invalidate_cached_user(current_user.supabase_id)
+
     # Log activity
     from app.repositories.activity_repository import ActivityRepository
     from app.models.database import ActivityActionType
@@ -173,7 +254,8 @@ async def update_profile(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
-    
+    invalidate_cached_user(current_user.supabase_id)
+
     # Log activity
     from app.repositories.activity_repository import ActivityRepository
     from app.models.database import ActivityActionType
@@ -251,6 +333,7 @@ async def update_user_settings(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    invalidate_cached_user(current_user.supabase_id)
 
     # Log activity
     from app.repositories.activity_repository import ActivityRepository
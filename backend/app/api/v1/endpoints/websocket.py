@@ -4,14 +4,15 @@ Handles WebSocket connections, authentication, and real-time task updates.
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from typing import Optional
-import json
 import logging
 import uuid
 import asyncio
+import orjson
+import time
 from datetime import datetime
 
 from app.core.auth import get_current_user_websocket, CurrentUser
-from app.core.database import get_session
+from app.core.database import get_session, async_session_maker
 from app.infrastructure.websocket import manager, TaskEvent
 from app.models.database import User, Task
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,11 +21,50 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Positive project-access results for POST /ws/broadcast, keyed by
+# (user_id, project_id) -> monotonic expiry. TTL is deliberately tiny:
+# it only absorbs bursts, revocations still land within a second.
+_access_cache: dict = {}
+_ACCESS_TTL = 1.0
+_ACCESS_CACHE_MAX = 1024
+
+# Constant error payloads, serialized once at import; an abusive client
+# spamming malformed frames otherwise costs a dict + dumps per message
+_INVALID_JSON_PAYLOAD = orjson.dumps({
+    "event": "error",
+    "data": {"message": "Invalid JSON format"}
+}).decode()
+_HANDLER_ERROR_PAYLOAD = orjson.dumps({
+    "event": "error",
+    "data": {"message": "Message handling error"}
+}).decode()
+
+
+async def _heartbeat(connection) -> None:
+    """Ping a connection every 30s until cancelled.
+
+    One long-lived task per connection replaces the old per-message
+    asyncio.wait_for timeout, which registered and cancelled an event-loop
+    timer for every frame received. A failed ping tears the connection
+    down via _send_to_connection, which unblocks the receive loop.
+    """
+    try:
+        while True:
+            await asyncio.sleep(30.0)
+            alive = await manager._send_to_connection(connection, {
+                "type": "ping",
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            if not alive:
+                break
+    except asyncio.CancelledError:
+        pass
+
+
 @router.websocket("/ws/{token}")
 async def websocket_endpoint(
     websocket: WebSocket,
-    token: str,
-    session: AsyncSession = Depends(get_session)
+    token: str
 ):
     """
     WebSocket endpoint for real-time collaboration.
@@ -53,9 +93,14 @@ async def websocket_endpoint(
     ```
     """
     try:
-        # Authenticate user from JWT token
+        # Authenticate user from JWT token. The session lives only for
+        # the handshake: a Depends(get_session) here would pin a pool
+        # connection for the whole WebSocket lifetime, and idle sockets
+        # would exhaust the pool long before the server runs out of
+        # connection capacity.
         logger.info(f"WebSocket connection attempt with token: {token[:50]}...")
-        user = await get_current_user_websocket(token, session)
+        async with async_session_maker() as session:
+            user = await get_current_user_websocket(token, session)
         if not user:
             logger.error(f"WebSocket authentication failed for token: {token[:50]}...")
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token")
@@ -64,40 +109,31 @@ async def websocket_endpoint(
         
         # Accept connection and register with manager
         connection = await manager.connect(websocket, str(user.id))
-        
+
+        # Server-driven liveness: one heartbeat task per connection
+        heartbeat = asyncio.create_task(_heartbeat(connection))
+
         try:
             # Main message loop
             while True:
                 try:
-                    # Receive message from client with timeout
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=60.0)
-                    
+                    # Receive blocks unbounded; the heartbeat task detects
+                    # dead peers and closes the socket, unblocking us
+                    data = await websocket.receive_text()
+
                     try:
-                        message = json.loads(data)
+                        # orjson parses in C without holding the GIL for long
+                        message = orjson.loads(data)
                         await manager.handle_message(connection, message)
-                        
-                    except json.JSONDecodeError:
+
+                    except orjson.JSONDecodeError:
                         logger.error(f"Invalid JSON received from {connection.connection_id}: {data}")
-                        await manager._send_to_connection(connection, {
-                            "event": "error",
-                            "data": {"message": "Invalid JSON format"}
-                        })
-                        
+                        await manager._send_raw(connection, _INVALID_JSON_PAYLOAD)
+
                     except Exception as e:
                         logger.error(f"Error handling message from {connection.connection_id}: {e}")
-                        await manager._send_to_connection(connection, {
-                            "event": "error", 
-                            "data": {"message": "Message handling error"}
-                        })
+                        await manager._send_raw(connection, _HANDLER_ERROR_PAYLOAD)
                         
-                except asyncio.TimeoutError:
-                    # Send ping to check if connection is still alive
-                    await manager._send_to_connection(connection, {
-                        "type": "ping",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                    continue
-                    
                 except WebSocketDisconnect:
                     logger.info(f"WebSocket disconnected normally: {connection.connection_id}")
                     break
@@ -117,7 +153,9 @@ async def websocket_endpoint(
         await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Connection error")
         
     finally:
-        # Clean up connection
+        # Clean up connection and its heartbeat task
+        if 'heartbeat' in locals():
+            heartbeat.cancel()
         if 'connection' in locals():
             await manager.disconnect(connection)
 
@@ -147,25 +185,31 @@ async def broadcast_task_event(
     
     Used internally by the API to notify connected clients of task changes.
     """
-    # Verify user has access to the project
-    from app.models.database import Project
-    from sqlmodel import select, and_
-    
-    stmt = select(Project).where(
-        and_(
-            Project.id == project_id,
-            Project.owner_id == current_user.id
-        )
-    )
-    result = await session.execute(stmt)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found or access denied"
+    # Verify user has access to the project; a burst of broadcasts for the
+    # same project re-checks the same ownership row, so positive results
+    # are remembered for a second
+    access_key = (str(current_user.id), str(project_id))
+    if _access_cache.get(access_key, 0.0) <= time.monotonic():
+        from app.models.database import Project
+        from sqlmodel import select, and_
+
+        stmt = select(Project.id).where(
+            and_(
+                Project.id == project_id,
+                Project.owner_id == current_user.id
+            )
         )
-    
+        project = await session.scalar(stmt)
+
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found or access denied"
+            )
+        if len(_access_cache) >= _ACCESS_CACHE_MAX:
+            _access_cache.clear()
+        _access_cache[access_key] = time.monotonic() + _ACCESS_TTL
+
     # Create and broadcast event
     event = TaskEvent(
         event_type=event_type,
@@ -175,8 +219,8 @@ async def broadcast_task_event(
         timestamp=datetime.utcnow()
     )
     
-    await manager.broadcast_task_event(event, str(project_id))
-    
+    await manager.queue_task_event(event, str(project_id))
+
     return {"message": "Event broadcasted successfully"}
 
 @router.post("/ws/cleanup")
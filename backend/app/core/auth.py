@@ -3,16 +3,26 @@ Authentication using Supabase Auth.
 Integrates with Supabase's built-in authentication system.
 """
 from typing import Optional, Dict, Any
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import jwt as jose_jwt
+from jose.exceptions import JWTError
 from supabase import create_client, Client
 from app.core.config import settings
 from app.core.database import get_session
 from app.models.database import User
 from sqlmodel import select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 import logging
 import asyncio
+import uuid
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import hashlib
 import json
@@ -25,79 +35,277 @@ supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 # Security scheme for FastAPI
 security = HTTPBearer()
 
-# Token cache to reduce Supabase API calls
-_token_cache: Dict[str, Dict[str, Any]] = {}
+# Shared executor for the blocking Supabase SDK calls: spawning a fresh
+# ThreadPoolExecutor per verification cost thread-creation syscalls on
+# the request hot path and tore the pool down again immediately
+_auth_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=32, thread_name_prefix="supabase-auth"
+)
+
+# In-flight online verifications by token digest (single-flight table)
+_inflight: Dict[bytes, asyncio.Future] = {}
+_inflight_lock = asyncio.Lock()
+
+
+def _consume_future_exception(fut: asyncio.Future) -> None:
+    """Mark a single-flight future's exception as retrieved.
+
+    Without this, a failed verification with no waiting followers logs
+    'exception was never retrieved' at garbage collection.
+    """
+    if not fut.cancelled():
+        fut.exception()
+
+# Token cache to reduce verification work, keyed by token digest.
+# Bounded LRU with TTL: entries are (monotonic expiry, user_data) tuples
+# in an OrderedDict, recency-ordered, with the oldest evicted past
+# maxsize - a hard memory ceiling under token rotation or abuse, where
+# the old unbounded dict pruned a key only when that same key was
+# looked up again.
+_token_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+_TOKEN_CACHE_MAX = 10_000
 _cache_ttl = 300  # 5 minutes
 
-# Circuit breaker for Supabase API
+# User-row cache keyed by supabase_id, same LRU+TTL shape as the token
+# cache. Saves the SELECT ... WHERE supabase_id=... that every
+# authenticated request otherwise pays; entries are detached User copies
+# merged into the request session without a load. The short TTL bounds
+# staleness, and profile/settings updates invalidate eagerly.
+_user_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+_USER_CACHE_MAX = 5_000
+_user_cache_ttl = 60  # 1 minute
+
+# Circuit breaker for Supabase API. Guarded by a lock: sync dependencies
+# and the auth executor mutate this from multiple threads, so the
+# read-modify-write on the failure counter would otherwise race.
+# last_failure is a time.monotonic() float - one vDSO call, no datetime
+# allocation, immune to wall-clock jumps (the old timedelta.seconds also
+# silently dropped whole days).
 _circuit_breaker_state = {
     "failures": 0,
-    "last_failure": None,
+    "last_failure": 0.0,
     "circuit_open": False
 }
+_circuit_breaker_lock = threading.Lock()
 _failure_threshold = 3
 _circuit_timeout = 30  # 30 seconds
 
 
-def _get_cache_key(token: str) -> str:
-    """Generate cache key from token hash"""
-    return hashlib.md5(token.encode()).hexdigest()
+def _get_cache_key(token: str) -> bytes:
+    """Generate cache key from token hash.
+
+    blake2b is SIMD-accelerated and several times faster per byte than
+    md5 on ~1KB JWTs; this is a keying hash, not a security boundary.
+    Raw 16-byte digests skip the hexlify step and halve key memory.
+    utf-8 because this also runs on raw Authorization header values
+    (the ASGI middleware pre-check), which are attacker-controlled and
+    not guaranteed to be base64url.
+    """
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
 
 
 def _is_token_cached(token: str) -> Optional[Dict[str, Any]]:
     """Check if token is cached and still valid"""
     cache_key = _get_cache_key(token)
-    if cache_key in _token_cache:
-        cached_data = _token_cache[cache_key]
-        if datetime.now() < cached_data["expires_at"]:
-            return cached_data["user_data"]
-        else:
-            # Remove expired cache entry
+    with _token_cache_lock:
+        entry = _token_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, user_data = entry
+        if time.monotonic() >= expires_at:
             del _token_cache[cache_key]
-    return None
+            return None
+        _token_cache.move_to_end(cache_key)
+        return user_data
+
+
+def _token_remaining_ttl(token: str) -> Optional[float]:
+    """Seconds until the token's own exp claim, from an unverified parse.
+
+    Claims are only used to cap the cache TTL - trusting them for
+    anything else would let a forged token ride the cache. Returns None
+    when the token has no parseable exp.
+    """
+    try:
+        exp = jose_jwt.get_unverified_claims(token).get("exp")
+        return None if exp is None else float(exp) - time.time()
+    except JWTError:
+        return None
 
 
 def _cache_token(token: str, user_data: Dict[str, Any]) -> None:
-    """Cache token verification result"""
+    """Cache token verification result.
+
+    The entry TTL is the fixed window capped by the token's exp claim,
+    so an entry never outlives the token it vouches for: a token with
+    20s of life left self-evicts in 20s, not 300.
+    """
+    ttl = _cache_ttl
+    remaining = _token_remaining_ttl(token)
+    if remaining is not None:
+        ttl = min(ttl, remaining)
+    if ttl <= 0:
+        return
+
     cache_key = _get_cache_key(token)
-    _token_cache[cache_key] = {
-        "user_data": user_data,
-        "expires_at": datetime.now() + timedelta(seconds=_cache_ttl)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (time.monotonic() + ttl, user_data)
+        _token_cache.move_to_end(cache_key)
+        while len(_token_cache) > _TOKEN_CACHE_MAX:
+            _token_cache.popitem(last=False)
+
+
+def _detached_user_copy(user: User) -> User:
+    """Build a session-independent copy of a loaded user row.
+
+    Only column attributes are copied, then the copy is promoted to the
+    detached state so session.merge(load=False) can attach it to a later
+    request's session without emitting a SELECT.
+    """
+    data = {
+        attr.key: getattr(user, attr.key)
+        for attr in sa_inspect(user).mapper.column_attrs
+    }
+    copy = User(**data)
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _get_cached_user(supabase_id: str) -> Optional[User]:
+    """Return a fresh detached copy of a cached user row, if any"""
+    with _user_cache_lock:
+        entry = _user_cache.get(supabase_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            del _user_cache[supabase_id]
+            return None
+        _user_cache.move_to_end(supabase_id)
+        # Hand out a copy per request: merge() mutates its argument's
+        # state, so sharing one instance across sessions is unsafe
+        return _detached_user_copy(user)
+
+
+def _cache_user(user: User) -> None:
+    """Cache a detached copy of a user row keyed by supabase_id"""
+    if not user.supabase_id:
+        return
+    with _user_cache_lock:
+        _user_cache[user.supabase_id] = (
+            time.monotonic() + _user_cache_ttl,
+            _detached_user_copy(user),
+        )
+        _user_cache.move_to_end(user.supabase_id)
+        while len(_user_cache) > _USER_CACHE_MAX:
+            _user_cache.popitem(last=False)
+
+
+def invalidate_cached_user(supabase_id: Optional[str]) -> None:
+    """Drop a user's cached row after a profile/settings mutation"""
+    if not supabase_id:
+        return
+    with _user_cache_lock:
+        _user_cache.pop(supabase_id, None)
+
+
+def _decode_token_offline(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a Supabase access token locally, without a network hop.
+
+    Supabase signs access tokens with the project JWT secret (HS256);
+    checking the signature, expiry and audience in-process is
+    sub-millisecond versus 100-500ms for auth.get_user. Returns the
+    user_data dict on success, None when no secret is configured (caller
+    falls back to online verification), and raises JWTError for invalid
+    or expired tokens. Revocation staleness is bounded by the short
+    access-token lifetime, same trade-off as the online result cache.
+    """
+    if not settings.SUPABASE_JWT_SECRET:
+        return None
+
+    claims = jose_jwt.decode(
+        token,
+        settings.SUPABASE_JWT_SECRET,
+        algorithms=["HS256"],
+        audience="authenticated",
+        options={"require_exp": True, "require_sub": True},
+    )
+    return {
+        "id": claims["sub"],
+        "email": claims.get("email"),
+        "metadata": claims.get("user_metadata") or {},
     }
 
 
 def _is_circuit_open() -> bool:
     """Check if circuit breaker is open"""
-    if not _circuit_breaker_state["circuit_open"]:
-        return False
-    
-    # Check if timeout has passed
-    if _circuit_breaker_state["last_failure"]:
-        time_since_failure = (datetime.now() - _circuit_breaker_state["last_failure"]).seconds
-        if time_since_failure > _circuit_timeout:
-            # Reset circuit breaker
-            _circuit_breaker_state["circuit_open"] = False
-            _circuit_breaker_state["failures"] = 0
-            logger.info("Circuit breaker reset - attempting Supabase connection")
+    with _circuit_breaker_lock:
+        if not _circuit_breaker_state["circuit_open"]:
             return False
-    
-    return True
+
+        # Check if timeout has passed
+        if _circuit_breaker_state["last_failure"]:
+            time_since_failure = time.monotonic() - _circuit_breaker_state["last_failure"]
+            if time_since_failure > _circuit_timeout:
+                # Reset circuit breaker
+                _circuit_breaker_state["circuit_open"] = False
+                _circuit_breaker_state["failures"] = 0
+                logger.info("Circuit breaker reset - attempting Supabase connection")
+                return False
+
+        return True
 
 
 def _record_failure() -> None:
     """Record a failure for circuit breaker"""
-    _circuit_breaker_state["failures"] += 1
-    _circuit_breaker_state["last_failure"] = datetime.now()
-    
-    if _circuit_breaker_state["failures"] >= _failure_threshold:
-        _circuit_breaker_state["circuit_open"] = True
+    with _circuit_breaker_lock:
+        _circuit_breaker_state["failures"] += 1
+        _circuit_breaker_state["last_failure"] = time.monotonic()
+
+        opened = _circuit_breaker_state["failures"] >= _failure_threshold
+        if opened:
+            _circuit_breaker_state["circuit_open"] = True
+
+    if opened:
         logger.error(f"Circuit breaker opened after {_failure_threshold} failures")
 
 
 def _record_success() -> None:
     """Record a success - reset failure count"""
-    _circuit_breaker_state["failures"] = 0
-    _circuit_breaker_state["circuit_open"] = False
+    with _circuit_breaker_lock:
+        _circuit_breaker_state["failures"] = 0
+        _circuit_breaker_state["circuit_open"] = False
+
+
+class AuthASGIMiddleware:
+    """Pure-ASGI middleware that pre-resolves cached token verification.
+
+    Runs before the routing/dependency machinery with none of
+    BaseHTTPMiddleware's wrapper overhead. When the Bearer token is
+    already in the local verification cache, the decoded claims are
+    stashed in the connection state and get_current_user skips the
+    HTTPBearer + Supabase round entirely. Cache misses and missing or
+    invalid tokens fall through untouched, so every error path (403 on
+    no header, 401/503 from verification) is produced by exactly the
+    same code as before.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope.get("headers", []):
+                if name == b"authorization":
+                    auth = value.decode("latin-1")
+                    if auth.lower().startswith("bearer "):
+                        cached = _is_token_cached(auth[7:])
+                        if cached is not None:
+                            scope.setdefault("state", {})["token_data"] = cached
+                    break
+        await self.app(scope, receive, send)
 
 
 class SupabaseAuth:
@@ -116,7 +324,58 @@ class SupabaseAuth:
         if cached_result:
             logger.debug("Token verification served from cache")
             return cached_result
-        
+
+        # Offline signature verification when the JWT secret is
+        # configured: no Supabase round-trip, no circuit breaker needed
+        try:
+            offline_data = _decode_token_offline(token)
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if offline_data is not None:
+            _cache_token(token, offline_data)
+            return offline_data
+
+        # Single-flight: when a page load fires N parallel requests with
+        # the same just-expired token, only the first coroutine performs
+        # the online verification; the rest await its future. Keeps a
+        # cache-miss stampede from issuing N Supabase calls (and from
+        # tripping the circuit breaker N times on an outage).
+        key = _get_cache_key(token)
+        loop = asyncio.get_running_loop()
+        async with _inflight_lock:
+            fut = _inflight.get(key)
+            if fut is not None:
+                leader = False
+            else:
+                fut = loop.create_future()
+                fut.add_done_callback(_consume_future_exception)
+                _inflight[key] = fut
+                leader = True
+
+        if not leader:
+            return await asyncio.shield(fut)
+
+        try:
+            user_data = await SupabaseAuth._verify_token_online(token)
+        except BaseException as exc:
+            if not fut.done():
+                fut.set_exception(exc)
+            raise
+        else:
+            if not fut.done():
+                fut.set_result(user_data)
+            return user_data
+        finally:
+            async with _inflight_lock:
+                _inflight.pop(key, None)
+
+    @staticmethod
+    async def _verify_token_online(token: str) -> Dict[str, Any]:
+        """Verify a token against Supabase (circuit-broken, cached)."""
         # Check circuit breaker
         if _is_circuit_open():
             logger.error("Authentication service unavailable - circuit breaker is open")
@@ -125,27 +384,28 @@ class SupabaseAuth:
                 detail="Authentication service temporarily unavailable - please try again later",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
+
         try:
-            # Verify token with Supabase with aggressive timeout
-            import concurrent.futures
-            
             def get_user_sync():
                 return supabase.auth.get_user(token)
-            
-            # Use aggressive 2-second timeout for faster failure detection
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(get_user_sync)
-                try:
-                    user_response = future.result(timeout=2.0)
-                except concurrent.futures.TimeoutError:
-                    logger.error("Supabase auth request timed out after 2 seconds")
-                    _record_failure()
-                    raise HTTPException(
-                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                        detail="Authentication service timeout - service may be slow",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
+
+            # Aggressive 2-second timeout on the shared executor; awaiting
+            # keeps the event loop free instead of blocking on .result()
+            try:
+                user_response = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        _auth_executor, get_user_sync
+                    ),
+                    timeout=2.0,
+                )
+            except asyncio.TimeoutError:
+                logger.error("Supabase auth request timed out after 2 seconds")
+                _record_failure()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service timeout - service may be slow",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
             
             if not user_response or not user_response.user:
                 logger.warning("Invalid token - no user found")
@@ -294,50 +554,85 @@ class SupabaseAuth:
             )
 
 
+async def _upsert_user(
+    session: AsyncSession,
+    supabase_id: str,
+    email: str,
+    full_name: Optional[str],
+) -> User:
+    """Create-or-link a user row in one atomic statement.
+
+    First logins used to take two SELECTs (by supabase_id, then email)
+    plus INSERT/COMMIT/REFRESH, with a TOCTOU window between the SELECTs.
+    ON CONFLICT (email) DO UPDATE handles the seed-data case - row exists
+    with this email but a placeholder supabase_id - and RETURNING hands
+    back the final row, so no refresh is needed.
+    """
+    stmt = (
+        pg_insert(User)
+        .values(
+            id=uuid.uuid4(),
+            supabase_id=supabase_id,
+            email=email,
+            username=email.partition("@")[0],  # Default username from email
+            full_name=full_name,
+            is_active=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        )
+        .on_conflict_do_update(
+            index_elements=["email"],
+            set_={"supabase_id": supabase_id},
+        )
+        .returning(User)
+    )
+    result = await session.execute(stmt)
+    user = result.scalars().first()
+    await session.commit()
+    return user
+
+
 async def get_current_user(
-    session: AsyncSession = Depends(get_session),
-    token_data: Dict[str, Any] = Depends(SupabaseAuth.verify_token)
+    request: Request,
+    session: AsyncSession = Depends(get_session)
 ) -> User:
     """
     Get current user from database.
     Creates user record if it doesn't exist (first login).
     Updates Supabase ID if user exists with email but different ID (seed data scenario).
     """
+    # Fast path: AuthASGIMiddleware already resolved the token from cache
+    token_data = request.scope.get("state", {}).get("token_data")
+    if token_data is None:
+        credentials = await security(request)
+        token_data = await SupabaseAuth.verify_token(credentials)
+
     supabase_id = token_data["id"]
     email = token_data["email"]
-    
+
+    # Cache-aside on the user row: merge(load=False) attaches the
+    # detached copy to this request's session without a SELECT
+    cached = _get_cached_user(supabase_id)
+    if cached is not None:
+        return await session.merge(cached, load=False)
+
     # Check if user exists in our database by Supabase ID
     stmt = select(User).where(User.supabase_id == supabase_id)
     result = await session.execute(stmt)
     user = result.scalar_one_or_none()
-    
+
     if not user:
-        # Check if user exists by email (might be seed data with placeholder ID)
-        stmt_email = select(User).where(User.email == email)
-        result_email = await session.execute(stmt_email)
-        user = result_email.scalar_one_or_none()
-        
-        if user:
-            # User exists with email but different Supabase ID - update it
-            logger.info(f"Updating Supabase ID for existing user {email}")
-            user.supabase_id = supabase_id
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
-        else:
-            # Create new user if doesn't exist at all
-            user = User(
-                supabase_id=supabase_id,
-                email=email,
-                username=email.split("@")[0],  # Default username from email
-                full_name=token_data.get("metadata", {}).get("full_name"),
-                is_active=True
-            )
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
-            logger.info(f"Created new user record for {email}")
-    
+        # First login (or seed data with a placeholder ID): one atomic
+        # upsert replaces the old SELECT-by-email + INSERT dance
+        user = await _upsert_user(
+            session,
+            supabase_id,
+            email,
+            token_data.get("metadata", {}).get("full_name"),
+        )
+        logger.info(f"Linked user record for {email}")
+
+    _cache_user(user)
     return user
 
 
@@ -351,14 +646,32 @@ async def get_current_user_websocket(
     Updates Supabase ID if user exists with email but different ID (seed data scenario).
     """
     try:
-        # Verify token with Supabase
-        user_response = supabase.auth.get_user(token)
-        
-        if not user_response or not user_response.user:
+        # Local signature check first; fall back to Supabase when no
+        # JWT secret is configured
+        try:
+            token_data = _decode_token_offline(token)
+        except JWTError:
             return None
-        
-        supabase_id = user_response.user.id
-        email = user_response.user.email
+
+        if token_data is not None:
+            supabase_id = token_data["id"]
+            email = token_data["email"]
+            metadata = token_data["metadata"]
+        else:
+            # The Supabase SDK is synchronous; run it on the shared auth
+            # executor so a 100-500ms introspection doesn't block the
+            # event loop and serialize concurrent WS handshakes
+            loop = asyncio.get_running_loop()
+            user_response = await loop.run_in_executor(
+                _auth_executor, supabase.auth.get_user, token
+            )
+
+            if not user_response or not user_response.user:
+                return None
+
+            supabase_id = user_response.user.id
+            email = user_response.user.email
+            metadata = user_response.user.user_metadata or {}
         
         # Check if user exists in our database by Supabase ID
         stmt = select(User).where(User.supabase_id == supabase_id)
@@ -366,32 +679,12 @@ async def get_current_user_websocket(
         user = result.scalar_one_or_none()
         
         if not user:
-            # Check if user exists by email (might be seed data with placeholder ID)
-            stmt_email = select(User).where(User.email == email)
-            result_email = await session.execute(stmt_email)
-            user = result_email.scalar_one_or_none()
-            
-            if user:
-                # User exists with email but different Supabase ID - update it
-                logger.info(f"Updating Supabase ID for existing WebSocket user {email}")
-                user.supabase_id = supabase_id
-                session.add(user)
-                await session.commit()
-                await session.refresh(user)
-            else:
-                # Create new user if doesn't exist at all
-                user = User(
-                    supabase_id=supabase_id,
-                    email=email,
-                    username=email.split("@")[0],  # Default username from email
-                    full_name=user_response.user.user_metadata.get("full_name") if user_response.user.user_metadata else None,
-                    is_active=True
-                )
-                session.add(user)
-                await session.commit()
-                await session.refresh(user)
-                logger.info(f"Created new user record for {email} via WebSocket")
-        
+            # Same atomic create-or-link as the HTTP path
+            user = await _upsert_user(
+                session, supabase_id, email, metadata.get("full_name")
+            )
+            logger.info(f"Linked user record for {email} via WebSocket")
+
         return user
         
     except Exception as e:
@@ -405,18 +698,29 @@ async def verify_token_string(token: str) -> Optional[Dict[str, Any]]:
     Returns user data or None if invalid.
     """
     try:
-        # Verify token with Supabase
-        user_response = supabase.auth.get_user(token)
-        
+        # Local signature check first; Supabase only when no secret is set
+        try:
+            token_data = _decode_token_offline(token)
+        except JWTError:
+            return None
+        if token_data is not None:
+            return token_data
+
+        # Off-loop for the same reason as get_current_user_websocket
+        loop = asyncio.get_running_loop()
+        user_response = await loop.run_in_executor(
+            _auth_executor, supabase.auth.get_user, token
+        )
+
         if not user_response or not user_response.user:
             return None
-        
+
         return {
             "id": user_response.user.id,
             "email": user_response.user.email,
             "metadata": user_response.user.user_metadata
         }
-        
+
     except Exception as e:
         logger.error(f"Token string verification failed: {e}")
         return None
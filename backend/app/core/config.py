@@ -6,12 +6,34 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field, field_validator
 from typing import Optional, Union
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 ENV_FILE = PROJECT_ROOT / ".env"
 
+# CORS defaults, frozen at import time so the property below can return
+# them by identity instead of rebuilding a list per access
+_PROD_ORIGINS: tuple = ("https://taskmanager.sulemankhan.me",)
+_DEV_ORIGINS: tuple = (
+    "http://localhost:8086",
+    "http://localhost:3000",
+    "http://localhost:5173",
+    "http://localhost:5174",
+    "http://127.0.0.1:8086",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:5174",
+    "https://taskmanager.sulemankhan.me",  # Allow production URL in dev for testing
+)
+
+
+@lru_cache(maxsize=8)
+def _split_origins(raw: str) -> tuple:
+    """Split a comma-separated origins string once and memoize it"""
+    return tuple(x.strip() for x in raw.split(','))
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -28,22 +50,37 @@ class Settings(BaseSettings):
     # Supabase Configuration
     DATABASE_URL: str  # Connection pooling URL from Supabase
     DIRECT_URL: str  # Direct connection for migrations
+    READ_REPLICA_URL: Optional[str] = None  # Optional read replica for GET endpoints
     SUPABASE_URL: str
     SUPABASE_KEY: str  # Service role key for backend operations
+    # Project JWT secret: when set, access tokens are verified locally
+    # (HS256 signature + exp/aud) instead of a Supabase round-trip
+    SUPABASE_JWT_SECRET: Optional[str] = None
     
+    # Database pool sizing - None means scale from the CPU count at
+    # startup (see app.core.database)
+    POOL_SIZE: Optional[int] = None
+    MAX_OVERFLOW: Optional[int] = None
+    # Opt-in SELECT-1 on checkout for HA setups with flaky networks; the
+    # default relies on a free protocol-level liveness check + recycle
+    POOL_PRE_PING: bool = False
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     
     # Redis Configuration (optional for caching)
+    # "redis" shares one coherent cache across uvicorn workers;
+    # "memory" keeps the per-process cache (fine for a single worker)
+    CACHE_BACKEND: str = "memory"
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
     
     @computed_field
-    @property
+    @cached_property
     def REDIS_URL(self) -> str:
         if self.REDIS_PASSWORD:
             return f"redis://:{self.REDIS_PASSWORD}@{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
@@ -73,31 +110,30 @@ class Settings(BaseSettings):
         return v
     
     @computed_field
-    @property
-    def CORS_ORIGINS(self) -> list[str]:
-        """Get CORS origins based on environment"""
+    @cached_property
+    def CORS_ORIGINS(self) -> tuple:
+        """Get CORS origins based on environment.
+
+        cached_property computes this once per Settings instance; the
+        defaults are module-level tuples returned by identity, so repeated
+        access never re-allocates the origin strings.
+        """
         if self.BACKEND_CORS_ORIGINS:
             # Use explicitly set origins
             if isinstance(self.BACKEND_CORS_ORIGINS, str):
-                return [x.strip() for x in self.BACKEND_CORS_ORIGINS.split(',')]
-            return self.BACKEND_CORS_ORIGINS
-        
+                return _split_origins(self.BACKEND_CORS_ORIGINS)
+            return tuple(self.BACKEND_CORS_ORIGINS)
+
         # Default based on environment
         if self.ENVIRONMENT == "production":
-            return ["https://taskmanager.sulemankhan.me"]
-        else:
-            # Development defaults
-            return [
-                "http://localhost:8086",
-                "http://localhost:3000", 
-                "http://localhost:5173",
-                "http://localhost:5174",
-                "http://127.0.0.1:8086",
-                "http://127.0.0.1:3000",
-                "http://127.0.0.1:5173",
-                "http://127.0.0.1:5174",
-                "https://taskmanager.sulemankhan.me",  # Allow production URL in dev for testing
-            ]
+            return _PROD_ORIGINS
+        return _DEV_ORIGINS
+
 
+settings = Settings()
 
-settings = Settings()
\ No newline at end of file
+# Prime the cached computed fields once at import. cached_property is a
+# non-data descriptor, so after the first access these become plain
+# instance-dict lookups - no descriptor dispatch or string formatting on
+# per-request reads (CORS middleware, cache clients).
+_ = (settings.REDIS_URL, settings.CORS_ORIGINS)
\ No newline at end of file
@@ -2,11 +2,18 @@
 Database configuration using SQLModel with Supabase PostgreSQL.
 Supports both async operations and connection pooling.
 """
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from sqlmodel import SQLModel
 from app.core.config import settings
+from typing import Optional
+import asyncio
+import asyncpg
 import logging
-from urllib.parse import urlparse, quote_plus
+import os
+import uuid
+from sqlalchemy.engine import make_url
 
 logger = logging.getLogger(__name__)
 
@@ -21,110 +28,134 @@ def build_async_database_url(database_url: str) -> str:
     Parse database URL and rebuild for async support.
     Converts postgresql:// to postgresql+asyncpg:// and filters incompatible parameters.
     Assumes password is already properly URL-encoded in the input URL.
+
+    One make_url() pass replaces the hand-rolled split/rsplit/parse_qs
+    pipeline; the URL object is immutable and re-renders credentials
+    with the same percent-encoding they arrived with.
     """
-    # Handle URLs with pre-encoded passwords
     if '://' not in database_url:
         raise ValueError("Invalid database URL format")
-    
-    # Split scheme and rest
-    scheme, rest = database_url.split('://', 1)
-    
-    # Find the @ that separates credentials from host
-    if '@' not in rest:
+
+    url = make_url(database_url)
+    if not url.username:
         raise ValueError("No credentials found in database URL")
-    
-    # Split credentials and host part
-    credentials_part, host_part = rest.rsplit('@', 1)
-    
-    # Use credentials as-is (already encoded in .env)
-    credentials = credentials_part
-    
-    # Parse host part (host:port/database?query)
-    host_info = host_part
-    
-    # Extract query parameters
-    query = ""
-    if '?' in host_info:
-        host_info, query = host_info.split('?', 1)
-    
-    # Extract database
-    database = ""
-    if '/' in host_info:
-        host_port, database = host_info.split('/', 1)
-    else:
-        host_port = host_info
-    
-    # Parse host and port
-    if ':' in host_port and not host_port.startswith('['):  # Not IPv6
-        hostname, port_str = host_port.rsplit(':', 1)
-        try:
-            port = int(port_str)
-        except ValueError:
-            # Port is not a number, treat as part of hostname
-            hostname = host_port
-            port = None
-    else:
-        hostname = host_port
-        port = None
-    
-    # Build the URL
-    url_parts = ["postgresql+asyncpg://"]
-    if credentials:
-        url_parts.append(f"{credentials}@")
-    
-    url_parts.append(hostname)
-    if port:
-        url_parts.append(f":{port}")
-    
-    if database:
-        url_parts.append(f"/{database}")
-    
-    # Filter out pgbouncer and other incompatible parameters for asyncpg
-    if query:
-        from urllib.parse import parse_qs, urlencode
-        query_params = parse_qs(query)
-        
-        # Remove parameters that asyncpg doesn't support
-        filtered_params = {
-            k: v for k, v in query_params.items() 
-            if k not in ['pgbouncer']
-        }
-        
-        if filtered_params:
-            # Rebuild query string
-            new_query = urlencode(filtered_params, doseq=True)
-            url_parts.append(f"?{new_query}")
-    
-    return "".join(url_parts)
+
+    url = url.set(drivername="postgresql+asyncpg")
+    # Drop parameters that asyncpg doesn't support
+    if "pgbouncer" in url.query:
+        url = url.difference_update_query(["pgbouncer"])
+
+    return url.render_as_string(hide_password=False)
 
 
 # Create async engine with connection pooling
 # Using the properly encoded database URL
 async_database_url = build_async_database_url(settings.DATABASE_URL)
-logger.info(f"Connecting to database with host: {urlparse(settings.DATABASE_URL).hostname}")
+logger.info(f"Connecting to database with host: {make_url(async_database_url).host}")
 
-# Add statement cache size 0 for pgbouncer compatibility
-connect_args = {}
-if ('pooler.supabase.com' in settings.DATABASE_URL) or ('pgbouncer=true' in settings.DATABASE_URL):
-    # This is a pooled connection (pgbouncer), disable statement cache
+# Add statement cache size 0 for pgbouncer compatibility. Supavisor
+# (Supabase's pooler) also answers transaction mode on port 6543.
+_is_pgbouncer = (
+    ('pooler.supabase.com' in settings.DATABASE_URL)
+    or ('pgbouncer=true' in settings.DATABASE_URL)
+    or (make_url(async_database_url).port == 6543)
+)
+# Disable PostgreSQL JIT per-connection: OLTP statements are short and
+# the JIT warm-up adds latency variance with no payoff at this scale
+connect_args = {"server_settings": {"jit": "off"}}
+if _is_pgbouncer:
+    # Pooled connection (pgbouncer in transaction mode): server-side prepared
+    # statements break because consecutive queries may land on different
+    # backends, so disable both asyncpg's and the dialect's caches, and
+    # randomize statement names so the __asyncpg_stmt_N__ counters from
+    # different clients cannot collide on a shared backend
     connect_args['statement_cache_size'] = 0
-    logger.info("Applied PGBouncer compatibility: statement_cache_size = 0")
+    connect_args['prepared_statement_cache_size'] = 0
+    connect_args['prepared_statement_name_func'] = (
+        lambda: f"__asyncpg_{uuid.uuid4().hex}__"
+    )
+    logger.info("Applied PGBouncer compatibility: statement caches disabled")
+else:
+    # Direct connection: a generously sized prepared-statement cache lets
+    # repeated hot queries skip PARSE/BIND entirely
+    connect_args['statement_cache_size'] = 1024
+    logger.info("Direct connection: asyncpg prepared-statement cache enabled")
+
+# Pool sizing: explicit via POOL_SIZE/MAX_OVERFLOW env, otherwise scaled
+# from the CPU count. Behind pgbouncer/Supavisor the pooler already
+# multiplexes connections, so client-side QueuePool on top double-pools;
+# NullPool hands every checkout straight to the external pooler.
+_pool_size = settings.POOL_SIZE or min(32, (os.cpu_count() or 4) * 4)
+_max_overflow = settings.MAX_OVERFLOW or _pool_size * 2
+if _is_pgbouncer:
+    _pool_kwargs = {"poolclass": NullPool}
+    logger.info("External pooler detected: NullPool engine (no client-side pooling)")
+else:
+    _pool_kwargs = {
+        # Explicit async pool class: passing the sync QueuePool here
+        # hangs asyncpg
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": _pool_size,
+        "max_overflow": _max_overflow,  # Burst capacity under load spikes
+        # pre-ping costs a round-trip per checkout; the default liveness
+        # story is the free is_closed() checkout listener below plus a
+        # 30-minute recycle, with SELECT-1 available via POOL_PRE_PING
+        "pool_pre_ping": settings.POOL_PRE_PING,
+        "pool_recycle": 1800,  # Recycle connections after 30 minutes
+        "pool_timeout": 30,  # Timeout for getting connection from pool
+    }
+    logger.info(f"Client-side pool: size={_pool_size}, max_overflow={_max_overflow}")
 
 engine = create_async_engine(
     async_database_url,
     echo=False,  # Disable SQL statement logging
     future=True,
-    pool_size=5,  # Reduced for local PostgreSQL
-    max_overflow=10,  # Reduced for local PostgreSQL
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_timeout=30,  # Timeout for getting connection from pool
     connect_args=connect_args,
     # Add these to prevent bulk operation issues
     isolation_level="READ_COMMITTED",
-    query_cache_size=1200
+    query_cache_size=1200,
+    **_pool_kwargs,
 )
 
+# Read-only engine: points at the replica when one is configured so GET
+# traffic doesn't compete with writes for primary connection slots.
+# Without a replica it falls back to the primary engine (and its pool).
+if settings.READ_REPLICA_URL:
+    read_engine = create_async_engine(
+        build_async_database_url(settings.READ_REPLICA_URL),
+        echo=False,
+        future=True,
+        connect_args=connect_args,
+        isolation_level="READ_COMMITTED",
+        query_cache_size=1200,
+        **_pool_kwargs,
+    )
+    logger.info("Read replica configured for read-only sessions")
+else:
+    read_engine = engine
+
+def _register_checkout_liveness(target_engine) -> None:
+    """Reject closed connections at checkout without a network hop.
+
+    asyncpg tracks socket state locally, so is_closed() is a free
+    attribute read versus the SELECT 1 round-trip pre-ping pays per
+    checkout. Raising DisconnectionError makes SQLAlchemy invalidate
+    the record and transparently retry with another connection.
+    """
+    from sqlalchemy import event, exc
+
+    @event.listens_for(target_engine.sync_engine, "checkout")
+    def _checkout_ping(dbapi_connection, connection_record, connection_proxy):
+        raw = getattr(dbapi_connection, "_connection", None)
+        if raw is not None and raw.is_closed():
+            raise exc.DisconnectionError()
+
+
+if not _is_pgbouncer:
+    _register_checkout_liveness(engine)
+    if read_engine is not engine:
+        _register_checkout_liveness(read_engine)
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -134,6 +165,14 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_session() -> AsyncSession:
     """
@@ -151,6 +190,131 @@ async def get_session() -> AsyncSession:
             await session.close()
 
 
+async def get_read_session() -> AsyncSession:
+    """
+    Dependency for read-only endpoints.
+    Sessions come from the replica engine when READ_REPLICA_URL is set;
+    no commit on exit since these code paths never write.
+    """
+    async with read_session_maker() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+# Process-wide asyncpg pool for hot read-mostly endpoints.
+# Skips the ORM Session/identity-map overhead entirely.
+_pg_pool: Optional[asyncpg.Pool] = None
+
+
+def build_asyncpg_dsn(database_url: str) -> str:
+    """Build a DSN suitable for raw asyncpg from the configured URL."""
+    # Reuse the async URL builder (it strips pgbouncer params), then drop
+    # the SQLAlchemy driver suffix that asyncpg does not understand.
+    return build_async_database_url(database_url).replace(
+        "postgresql+asyncpg://", "postgresql://", 1
+    )
+
+
+async def init_pool() -> asyncpg.Pool:
+    """Create the shared asyncpg pool. Called once at application startup."""
+    global _pg_pool
+    if _pg_pool is None:
+        _pg_pool = await asyncpg.create_pool(
+            dsn=build_asyncpg_dsn(settings.DATABASE_URL),
+            min_size=10,
+            max_size=50,
+            max_inactive_connection_lifetime=300,
+            command_timeout=60,
+            statement_cache_size=0 if _is_pgbouncer else 1024,
+        )
+        logger.info("asyncpg pool initialized")
+    return _pg_pool
+
+
+async def close_pool():
+    """Close the shared asyncpg pool on shutdown."""
+    global _pg_pool
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
+        logger.info("asyncpg pool closed")
+
+
+async def warm_pools():
+    """Open and ping pooled connections before traffic arrives.
+
+    The asyncpg pool establishes min_size connections eagerly, but the
+    SQLAlchemy engine connects lazily - without this, the first requests
+    after a deploy each pay a full TLS+auth handshake.
+    """
+    from sqlalchemy import text
+
+    async def _ping_engine():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _ping_pool():
+        if _pg_pool is not None:
+            async with _pg_pool.acquire() as conn:
+                await conn.execute("SELECT 1")
+
+    # Acquire concurrently so every slot is opened, not the same one
+    # reused. NullPool has no slots to warm, so ping once.
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    await asyncio.gather(
+        *(_ping_engine() for _ in range(pool_size)),
+        *(_ping_pool() for _ in range(_pg_pool.get_min_size() if _pg_pool else 0)),
+    )
+    logger.info("Connection pools warmed")
+
+
+def pool_status() -> dict:
+    """Snapshot of engine pool utilization for health/metrics endpoints."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        # NullPool keeps no slots; the external pooler owns utilization
+        return {"pool_class": type(pool).__name__}
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def get_pool() -> asyncpg.Pool:
+    """
+    Dependency to get the shared asyncpg pool.
+    Used in read-heavy FastAPI endpoints that bypass the ORM.
+    """
+    if _pg_pool is None:
+        await init_pool()
+    return _pg_pool
+
+
+# Schema invariants the application code relies on at runtime. create_all
+# only creates *missing* tables, so databases that predate a model change
+# never pick up new constraints from the models alone; anything listed here
+# must be idempotent because it runs on every startup.
+_SCHEMA_INVARIANTS = (
+    # add_member's INSERT ... ON CONFLICT (project_id, user_id) requires a
+    # matching unique index; without it every add-member request fails with
+    # "no unique or exclusion constraint matching the ON CONFLICT
+    # specification". Mirrors uq_project_members_project_user from
+    # backend/add_indexes.py (which builds it CONCURRENTLY for large,
+    # live tables - this startup variant is the guarantee, not the tool).
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_project_members_project_user
+    ON project_members (project_id, user_id)
+    """,
+)
+
+
 async def init_db():
     """
     Initialize database tables.
@@ -161,6 +325,19 @@ async def init_db():
         await conn.run_sync(SQLModel.metadata.create_all)
         logger.info("Database tables created successfully")
 
+    # Bring pre-existing databases up to the schema the code assumes.
+    # Each invariant runs in its own transaction so one failure (e.g.
+    # duplicate rows blocking a unique index) doesn't roll back the rest.
+    for ddl in _SCHEMA_INVARIANTS:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(ddl))
+        except Exception as e:
+            logger.error(
+                "Schema invariant failed - run backend/add_indexes.py and "
+                f"resolve manually before serving traffic: {e}"
+            )
+
 
 async def close_db():
     """Close database connections"""
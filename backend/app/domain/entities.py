@@ -4,7 +4,7 @@ These represent the core business concepts.
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import ClassVar, Dict, FrozenSet, Optional, List, Tuple
 from enum import Enum
 import uuid
 
@@ -26,9 +26,14 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
     CRITICAL = "critical"
 
-@dataclass
+@dataclass(slots=True)
 class TaskEntity:
-    """Domain entity for Task business logic"""
+    """Domain entity for Task business logic.
+
+    slots=True stores the 15 fields in fixed slots instead of a per-
+    instance dict - roughly half the memory and faster attribute access
+    when one of these is built per row on list endpoints.
+    """
     id: uuid.UUID
     title: str
     description: Optional[str]
@@ -44,20 +49,32 @@ class TaskEntity:
     completed_at: Optional[datetime]
     created_at: datetime
     updated_at: datetime
-    
+
+    # Transition tables built once at class definition: frozenset
+    # membership is an O(1) hash probe with no per-call list allocation
+    _COMPLETABLE: ClassVar[FrozenSet[TaskStatus]] = frozenset(
+        {TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.IN_REVIEW}
+    )
+    # (current, requested) -> actual status; encodes "TODO can't jump
+    # straight to DONE, it passes through IN_PROGRESS"
+    _TRANSITION_OVERRIDE: ClassVar[Dict[Tuple[TaskStatus, TaskStatus], TaskStatus]] = {
+        (TaskStatus.TODO, TaskStatus.DONE): TaskStatus.IN_PROGRESS,
+    }
+
     def can_be_completed(self) -> bool:
         """Check if task can be marked as completed"""
-        return self.status in [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.IN_REVIEW]
+        return self.status in self._COMPLETABLE
     
     def complete(self) -> None:
         """Mark task as completed"""
         if not self.can_be_completed():
             raise ValueError(f"Cannot complete task with status: {self.status}")
         
+        now = datetime.utcnow()
         self.completed = True
-        self.completed_at = datetime.utcnow()
+        self.completed_at = now
         self.status = TaskStatus.DONE
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now
     
     def uncomplete(self) -> None:
         """Mark task as incomplete"""
@@ -81,13 +98,10 @@ class TaskEntity:
     
     def change_status(self, new_status: TaskStatus) -> None:
         """Change task status with business rules"""
-        # Business rule: Can't go directly from TODO to DONE
-        if self.status == TaskStatus.TODO and new_status == TaskStatus.DONE:
-            # Automatically set to IN_PROGRESS first
-            self.status = TaskStatus.IN_PROGRESS
-        else:
-            self.status = new_status
-        
+        self.status = self._TRANSITION_OVERRIDE.get(
+            (self.status, new_status), new_status
+        )
+
         # Update completion status based on new status
         if new_status == TaskStatus.DONE and not self.completed:
             self.complete()
@@ -111,7 +125,7 @@ class TaskEntity:
         delta = self.due_date - datetime.utcnow()
         return delta.days
 
-@dataclass
+@dataclass(slots=True)
 class UserEntity:
     """Domain entity for User business logic"""
     id: uuid.UUID
@@ -129,7 +143,7 @@ class UserEntity:
         """Check if user can reassign a task"""
         return task.creator_id == self.id  # Only creator can reassign
 
-@dataclass
+@dataclass(slots=True)
 class ProjectEntity:
     """Domain entity for Project business logic"""
     id: uuid.UUID
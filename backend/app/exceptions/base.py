@@ -20,27 +20,28 @@ class SmartTaskException(Exception):
         self.status_code = status_code
         self.details = details or {}
         self.error_code = error_code or self.__class__.__name__
-        super().__init__(self.message)
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert exception to dictionary for API response"""
-        result = {
+        # The response payload is fully determined here, so build it once;
+        # to_dict is called per raised exception on hot 401/403/404 paths.
+        # Callers treat the dict as read-only (see exception handlers).
+        self._dict: Dict[str, Any] = {
             "error": True,
             "error_code": self.error_code,
             "message": self.message,
             "status_code": self.status_code
         }
-        
         if self.details:
-            result["details"] = self.details
-            
-        return result
-    
+            self._dict["details"] = self.details
+        super().__init__(self.message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert exception to dictionary for API response"""
+        return self._dict
+
     def to_http_exception(self) -> HTTPException:
         """Convert to FastAPI HTTPException"""
         return HTTPException(
             status_code=self.status_code,
-            detail=self.to_dict()
+            detail=self._dict
         )
 
 
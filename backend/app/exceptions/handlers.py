@@ -5,7 +5,7 @@ Provides consistent error responses and logging.
 import logging
 from typing import Union
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from pydantic import ValidationError as PydanticValidationError
@@ -14,8 +14,29 @@ from .base import SmartTaskException, ValidationError, NotFoundError, ConflictEr
 
 logger = logging.getLogger(__name__)
 
-
-async def smart_task_exception_handler(request: Request, exc: SmartTaskException) -> JSONResponse:
+# Fixed-shape error payloads built once at import; handlers copy and add
+# the per-request details key
+_VALIDATION_ERROR_TEMPLATE = {
+    "error": True,
+    "error_code": "VALIDATION_ERROR",
+    "message": "Request validation failed",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+}
+_PYDANTIC_ERROR_TEMPLATE = {
+    "error": True,
+    "error_code": "VALIDATION_ERROR",
+    "message": "Data validation failed",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+}
+_INTERNAL_ERROR_TEMPLATE = {
+    "error": True,
+    "error_code": "INTERNAL_SERVER_ERROR",
+    "message": "An unexpected error occurred",
+    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+}
+
+
+async def smart_task_exception_handler(request: Request, exc: SmartTaskException) -> ORJSONResponse:
     """Handle custom SmartTaskException"""
     logger.error(
         f"SmartTaskException: {exc.error_code} - {exc.message}",
@@ -28,13 +49,13 @@ async def smart_task_exception_handler(request: Request, exc: SmartTaskException
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict()
     )
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
     """Handle FastAPI request validation errors"""
     errors = []
     for error in exc.errors():
@@ -55,21 +76,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
-            "error": True,
-            "error_code": "VALIDATION_ERROR",
-            "message": "Request validation failed",
-            "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
-            "details": {
-                "validation_errors": errors
-            }
+            **_VALIDATION_ERROR_TEMPLATE,
+            "details": {"validation_errors": errors},
         }
     )
 
 
-async def pydantic_validation_exception_handler(request: Request, exc: PydanticValidationError) -> JSONResponse:
+async def pydantic_validation_exception_handler(request: Request, exc: PydanticValidationError) -> ORJSONResponse:
     """Handle Pydantic validation errors"""
     errors = []
     for error in exc.errors():
@@ -89,21 +105,16 @@ async def pydantic_validation_exception_handler(request: Request, exc: PydanticV
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
-            "error": True,
-            "error_code": "VALIDATION_ERROR",
-            "message": "Data validation failed",
-            "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
-            "details": {
-                "validation_errors": errors
-            }
+            **_PYDANTIC_ERROR_TEMPLATE,
+            "details": {"validation_errors": errors},
         }
     )
 
 
-async def integrity_error_handler(request: Request, exc: IntegrityError) -> JSONResponse:
+async def integrity_error_handler(request: Request, exc: IntegrityError) -> ORJSONResponse:
     """Handle database integrity constraint violations"""
     # Parse common constraint violations
     error_message = str(exc.orig) if exc.orig else str(exc)
@@ -126,13 +137,13 @@ async def integrity_error_handler(request: Request, exc: IntegrityError) -> JSON
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=conflict_error.status_code,
         content=conflict_error.to_dict()
     )
 
 
-async def not_found_error_handler(request: Request, exc: NoResultFound) -> JSONResponse:
+async def not_found_error_handler(request: Request, exc: NoResultFound) -> ORJSONResponse:
     """Handle SQLAlchemy NoResultFound errors"""
     not_found_error = NotFoundError("Resource", "unknown")
     
@@ -144,13 +155,13 @@ async def not_found_error_handler(request: Request, exc: NoResultFound) -> JSONR
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=not_found_error.status_code,
         content=not_found_error.to_dict()
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle unexpected exceptions"""
     logger.error(
         f"Unexpected error: {type(exc).__name__}: {str(exc)}",
@@ -162,16 +173,11 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
-            "error": True,
-            "error_code": "INTERNAL_SERVER_ERROR",
-            "message": "An unexpected error occurred",
-            "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
-            "details": {
-                "exception_type": type(exc).__name__
-            }
+            **_INTERNAL_ERROR_TEMPLATE,
+            "details": {"exception_type": type(exc).__name__},
         }
     )
 
@@ -2,122 +2,251 @@
 Cache infrastructure for performance optimization.
 Provides caching utilities for database queries and API responses.
 """
-from typing import Optional, Any, Dict
-import json
+from typing import Optional, Any, Callable, Dict
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+
+import orjson
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 class InMemoryCache:
-    """Simple in-memory cache for development/testing"""
-    
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
-    
+    """Simple in-memory cache for development/testing.
+
+    Entries are (deadline, value) tuples in an OrderedDict ordered by
+    recency: a get is one dict lookup plus a float compare against
+    time.monotonic(), and sets evict least-recently-used entries past
+    max_size, giving the cache a hard memory ceiling. The old
+    implementation wrapped every entry in a 3-key dict and constructed
+    datetimes on each access.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_size = max_size
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
-        
-        entry = self._cache[key]
-        
+
+        deadline, value = entry
+
         # Check expiration
-        if entry['expires_at'] and datetime.utcnow() > entry['expires_at']:
+        if deadline < time.monotonic():
             del self._cache[key]
             return None
-        
-        return entry['value']
-    
+
+        self._cache.move_to_end(key)
+        return value
+
     async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """Set value in cache with optional TTL"""
-        expires_at = None
-        if ttl_seconds:
-            expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-        
-        self._cache[key] = {
-            'value': value,
-            'expires_at': expires_at,
-            'created_at': datetime.utcnow()
-        }
-    
+        deadline = time.monotonic() + ttl_seconds if ttl_seconds else float('inf')
+        self._cache[key] = (deadline, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         if key in self._cache:
             del self._cache[key]
             return True
         return False
-    
+
     async def clear(self) -> None:
         """Clear all cached values"""
         self._cache.clear()
-    
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every string key starting with prefix; returns removed count"""
+        doomed = [
+            k for k in self._cache
+            if isinstance(k, str) and k.startswith(prefix)
+        ]
+        for key in doomed:
+            del self._cache[key]
+        return len(doomed)
+
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        now = datetime.utcnow()
+        now = time.monotonic()
         total_keys = len(self._cache)
         expired_keys = sum(
-            1 for entry in self._cache.values()
-            if entry['expires_at'] and now > entry['expires_at']
+            1 for deadline, _ in self._cache.values() if deadline < now
         )
-        
+
         return {
             'total_keys': total_keys,
             'expired_keys': expired_keys,
             'active_keys': total_keys - expired_keys
         }
 
+class RedisCache:
+    """Redis-backed cache sharing one coherent store across workers.
+
+    A per-process cache under `uvicorn --workers N` means N stale copies
+    of the same working set and invalidations that only reach one
+    worker. Values are orjson-serialized (payloads cached here are
+    already JSON-shaped dicts), and deletions use UNLINK so freeing
+    happens off the Redis event loop.
+    """
+
+    def __init__(self, url: str):
+        # Local import keeps the default in-memory backend importable
+        # without the redis package installed
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.Redis.from_url(url, decode_responses=False)
+
+    @staticmethod
+    def _key(key) -> str:
+        """Redis needs string keys; tuple keys stringify deterministically"""
+        return key if isinstance(key, str) else repr(key)
+
+    async def get(self, key) -> Optional[Any]:
+        """Get value from cache"""
+        raw = await self._redis.get(self._key(key))
+        return None if raw is None else orjson.loads(raw)
+
+    async def set(self, key, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """Set value in cache with optional TTL"""
+        await self._redis.set(self._key(key), orjson.dumps(value), ex=ttl_seconds)
+
+    async def delete(self, key) -> bool:
+        """Delete value from cache"""
+        return bool(await self._redis.unlink(self._key(key)))
+
+    async def clear(self) -> None:
+        """Clear all cached values"""
+        await self._redis.flushdb(asynchronous=True)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix; returns removed count"""
+        removed = 0
+        async for key in self._redis.scan_iter(match=prefix + "*"):
+            removed += await self._redis.unlink(key)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        # Key-level introspection lives in redis (INFO/DBSIZE); keep the
+        # sync interface and report the backend only
+        return {'backend': 'redis'}
+
 class CacheManager:
     """Cache manager with key pattern utilities"""
-    
-    def __init__(self, cache_impl: Optional[InMemoryCache] = None):
-        self.cache = cache_impl or InMemoryCache()
-    
-    def _user_tasks_key(self, user_id: str, page: int = 1, **filters) -> str:
-        """Generate cache key for user tasks"""
-        filter_str = "&".join(f"{k}={v}" for k, v in sorted(filters.items()) if v is not None)
-        return f"user:{user_id}:tasks:page:{page}:{filter_str}"
-    
-    def _task_stats_key(self, user_id: str) -> str:
+
+    def __init__(self, cache_impl=None):
+        if cache_impl is None:
+            if settings.CACHE_BACKEND == "redis":
+                cache_impl = RedisCache(settings.REDIS_URL)
+            else:
+                cache_impl = InMemoryCache()
+        self.cache = cache_impl
+        # Single-flight table: first miss per key runs the loader, any
+        # concurrent misses await its future instead of re-querying
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _user_tasks_key(self, user_id: str, page: int = 1, **filters):
+        """Generate cache key for user tasks.
+
+        A plain tuple: dicts hash it directly, with none of the sorted-
+        list/f-string/join allocations the old string key paid per
+        request. String-keyed backends stringify it on the way in.
+        """
+        return (
+            "ut",
+            user_id,
+            page,
+            tuple(sorted((k, v) for k, v in filters.items() if v is not None)),
+        )
+
+    def _task_stats_key(self, user_id: str, project_id: Optional[str] = None) -> str:
         """Generate cache key for task statistics"""
-        return f"user:{user_id}:stats"
-    
+        return f"user:{user_id}:stats:{project_id or 'all'}"
+
     def _task_key(self, task_id: str) -> str:
         """Generate cache key for individual task"""
         return f"task:{task_id}"
-    
+
     async def get_user_tasks(self, user_id: str, page: int = 1, **filters) -> Optional[Any]:
         """Get cached user tasks"""
         key = self._user_tasks_key(user_id, page, **filters)
         return await self.cache.get(key)
-    
+
     async def set_user_tasks(self, user_id: str, data: Any, page: int = 1, ttl: int = 300, **filters) -> None:
         """Cache user tasks"""
         key = self._user_tasks_key(user_id, page, **filters)
         await self.cache.set(key, data, ttl)
-    
-    async def get_task_stats(self, user_id: str) -> Optional[Any]:
+
+    async def get_task_stats(self, user_id: str, project_id: Optional[str] = None) -> Optional[Any]:
         """Get cached task statistics"""
-        key = self._task_stats_key(user_id)
+        key = self._task_stats_key(user_id, project_id)
         return await self.cache.get(key)
-    
-    async def set_task_stats(self, user_id: str, stats: Any, ttl: int = 300) -> None:
+
+    async def set_task_stats(self, user_id: str, stats: Any, ttl: int = 300, project_id: Optional[str] = None) -> None:
         """Cache task statistics"""
-        key = self._task_stats_key(user_id)
+        key = self._task_stats_key(user_id, project_id)
         await self.cache.set(key, stats, ttl)
-    
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable,
+        ttl_seconds: Optional[int] = None,
+    ) -> Any:
+        """Cache-aside read with single-flight miss handling.
+
+        A burst of N concurrent requests that miss the same key would
+        otherwise each run the loader (and its SQL) independently; here
+        the first caller loads and populates the cache while the rest
+        await its future. The check-then-register step has no awaits in
+        between, so it is atomic on the event loop.
+        """
+        value = await self.cache.get(key)
+        if value is not None:
+            return value
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        # A failed load with no followers should not warn at GC time
+        fut.add_done_callback(
+            lambda f: f.exception() if not f.cancelled() else None
+        )
+        self._inflight[key] = fut
+        try:
+            value = await loader()
+        except BaseException as exc:
+            if not fut.done():
+                fut.set_exception(exc)
+            raise
+        else:
+            await self.cache.set(key, value, ttl_seconds)
+            if not fut.done():
+                fut.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
     async def invalidate_user_cache(self, user_id: str) -> None:
         """Invalidate all cache entries for a user"""
-        # In a real implementation with Redis, we'd use pattern matching
-        # For now, we'll clear specific known keys
-        await self.cache.delete(self._task_stats_key(user_id))
-        
-        # In production, you'd implement pattern-based deletion
+        # Prefix deletion covers the per-project stats variants in one go
+        await self.cache.delete_prefix(f"user:{user_id}:stats")
         logger.info(f"Cache invalidated for user: {user_id}")
-    
+
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get overall cache statistics"""
         return self.cache.stats()
 
 # Global cache manager instance
-cache_manager = CacheManager()
\ No newline at end of file
+cache_manager = CacheManager()
@@ -6,8 +6,8 @@ from typing import Dict, Set, Optional, Any
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 import asyncio
-import json
 import logging
+import orjson
 import uuid
 from dataclasses import dataclass, asdict
 
@@ -76,7 +76,19 @@ class ConnectionManager:
         self.connections: Dict[str, WebSocketConnection] = {}
         # Dictionary: project_id -> Set of user_ids (for project-based broadcasting)
         self.project_subscriptions: Dict[str, Set[str]] = {}
-        
+        # Coalescing broadcast queues: project_id -> pending events, each
+        # drained by a single worker task so bursty updates fan out in
+        # batches instead of one broadcast loop per event
+        self._event_queues: Dict[str, asyncio.Queue] = {}
+        self._queue_workers: Dict[str, asyncio.Task] = {}
+        # Dispatch table for inbound message types: one dict lookup per
+        # message instead of walking an if/elif chain
+        self._handlers = {
+            "ping": self._handle_ping,
+            "subscribe_project": self._handle_subscribe_project,
+            "unsubscribe_project": self._handle_unsubscribe_project,
+        }
+
     async def connect(self, websocket: WebSocket, user_id: str) -> WebSocketConnection:
         """Accept and register a new WebSocket connection"""
         try:
@@ -143,14 +155,21 @@ class ConnectionManager:
     
     async def _send_to_connection(self, connection: WebSocketConnection, message: Dict[str, Any]) -> bool:
         """Send message to a specific connection"""
+        # orjson serializes several times faster than json and handles
+        # datetimes natively; decode keeps the frame textual so browser
+        # clients still receive a string for JSON.parse
+        return await self._send_raw(connection, orjson.dumps(message).decode())
+
+    async def _send_raw(self, connection: WebSocketConnection, payload: str) -> bool:
+        """Send a pre-serialized payload to a specific connection"""
         try:
             # Check if connection is still open
             if connection.websocket.client_state.name != 'CONNECTED':
                 logger.warning(f"Connection {connection.connection_id} is not connected, removing it")
                 await self.disconnect(connection)
                 return False
-                
-            await connection.websocket.send_text(json.dumps(message))
+
+            await connection.websocket.send_text(payload)
             return True
         except Exception as e:
             logger.error(f"Failed to send message to connection {connection.connection_id}: {e}")
@@ -196,11 +215,13 @@ class ConnectionManager:
         """Unsubscribe user from project notifications"""
         if project_id in self.project_subscriptions:
             self.project_subscriptions[project_id].discard(user_id)
-            
-            # Clean up empty project subscriptions
+
+            # Clean up empty project subscriptions, including the drain
+            # worker - nothing queued afterwards has a recipient
             if not self.project_subscriptions[project_id]:
                 del self.project_subscriptions[project_id]
-        
+                self._stop_queue_worker(project_id)
+
         logger.info(f"User {user_id} unsubscribed from project {project_id}")
     
     async def broadcast_task_event(self, event: TaskEvent, project_id: str):
@@ -217,7 +238,96 @@ class ConnectionManager:
         )
         
         logger.info(f"Broadcasted {event.event_type} for task {event.task_id} to project {project_id}")
-    
+
+    async def queue_task_event(self, event: TaskEvent, project_id: str):
+        """Enqueue a task event for coalesced broadcasting.
+
+        Bursts of events for the same project (bulk edits) are drained by
+        one worker per project, which serializes each event exactly once
+        and shares the payload across every recipient socket, instead of
+        re-dumping the message per connection.
+        """
+        queue = self._event_queues.get(project_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._event_queues[project_id] = queue
+            worker = asyncio.create_task(self._drain_events(project_id, queue))
+            self._queue_workers[project_id] = worker
+        await queue.put(event)
+
+    def _stop_queue_worker(self, project_id: str) -> None:
+        """Cancel the drain worker and drop the queue for a project"""
+        worker = self._queue_workers.pop(project_id, None)
+        if worker is not None:
+            worker.cancel()
+        self._event_queues.pop(project_id, None)
+
+    async def _drain_events(self, project_id: str, queue: asyncio.Queue):
+        """Worker loop: coalesce queued events and fan them out in batches"""
+        try:
+            while True:
+                events = [await queue.get()]
+                # Coalesce whatever else arrives within 10ms, bounded so a
+                # firehose cannot starve delivery
+                while len(events) < 50:
+                    try:
+                        events.append(await asyncio.wait_for(queue.get(), timeout=0.01))
+                    except asyncio.TimeoutError:
+                        break
+                await self._broadcast_batch(project_id, events)
+                # Idle with nobody listening: deregister and exit rather
+                # than parking a task per project forever (events can be
+                # queued for projects that never gain a subscriber). The
+                # check-and-pop has no awaits, so no event can slip into
+                # the queue between the emptiness test and removal.
+                if not self.project_subscriptions.get(project_id) and queue.empty():
+                    if self._event_queues.get(project_id) is queue:
+                        del self._event_queues[project_id]
+                        self._queue_workers.pop(project_id, None)
+                    return
+        except asyncio.CancelledError:
+            pass
+
+    async def shutdown(self):
+        """Stop every per-project drain worker.
+
+        Called from the application lifespan so shutdown doesn't leave
+        pending tasks behind; anything still queued at this point has no
+        live socket to go to.
+        """
+        workers = list(self._queue_workers.values())
+        self._queue_workers.clear()
+        self._event_queues.clear()
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _broadcast_batch(self, project_id: str, events):
+        """Send a batch of events, one shared serialization per event.
+
+        Events keep their individual frame format - browser clients
+        JSON.parse each frame - but the dumps() cost is paid once per
+        event rather than once per (event, connection) pair.
+        """
+        subscribers = self.project_subscriptions.get(project_id)
+        if not subscribers:
+            return
+
+        for event in events:
+            message = event.to_dict()
+            message["data"]["project_id"] = project_id
+            payload = orjson.dumps(message).decode()
+
+            for user_id in list(subscribers):
+                if user_id == event.user_id:
+                    # Don't send back to the user who triggered it
+                    continue
+                for connection in list(self.user_connections.get(user_id, [])):
+                    await self._send_raw(connection, payload)
+
+            logger.info(f"Broadcasted {event.event_type} for task {event.task_id} to project {project_id}")
+
     async def _broadcast_user_status(self, user_id: str, status: str):
         """Broadcast user online/offline status to relevant users"""
         message = {
@@ -235,37 +345,40 @@ class ConnectionManager:
                 await self.broadcast_to_project(project_id, message, exclude_user_id=user_id)
     
     async def handle_message(self, connection: WebSocketConnection, data: Dict[str, Any]):
-        """Handle incoming WebSocket messages"""
-        message_type = data.get("type", "")
-        
-        if message_type == "ping":
-            # Update last ping time
-            connection.last_ping = datetime.utcnow()
+        """Handle incoming WebSocket messages via the dispatch table"""
+        handler = self._handlers.get(data.get("type", ""))
+        if handler is None:
+            logger.warning(f"Unknown message type: {data.get('type', '')}")
+            return
+        await handler(connection, data)
+
+    async def _handle_ping(self, connection: WebSocketConnection, data: Dict[str, Any]):
+        """Update last ping time and answer with a pong"""
+        connection.last_ping = datetime.utcnow()
+        await self._send_to_connection(connection, {
+            "type": "pong",
+            "timestamp": datetime.utcnow().isoformat()
+        })
+
+    async def _handle_subscribe_project(self, connection: WebSocketConnection, data: Dict[str, Any]):
+        """Subscribe the connection's user to a project feed"""
+        project_id = data.get("project_id")
+        if project_id:
+            await self.subscribe_to_project(connection.user_id, project_id)
             await self._send_to_connection(connection, {
-                "type": "pong",
-                "timestamp": datetime.utcnow().isoformat()
+                "type": "subscribed",
+                "data": {"project_id": project_id}
+            })
+
+    async def _handle_unsubscribe_project(self, connection: WebSocketConnection, data: Dict[str, Any]):
+        """Unsubscribe the connection's user from a project feed"""
+        project_id = data.get("project_id")
+        if project_id:
+            await self.unsubscribe_from_project(connection.user_id, project_id)
+            await self._send_to_connection(connection, {
+                "type": "unsubscribed",
+                "data": {"project_id": project_id}
             })
-            
-        elif message_type == "subscribe_project":
-            project_id = data.get("project_id")
-            if project_id:
-                await self.subscribe_to_project(connection.user_id, project_id)
-                await self._send_to_connection(connection, {
-                    "type": "subscribed",
-                    "data": {"project_id": project_id}
-                })
-        
-        elif message_type == "unsubscribe_project":
-            project_id = data.get("project_id")
-            if project_id:
-                await self.unsubscribe_from_project(connection.user_id, project_id)
-                await self._send_to_connection(connection, {
-                    "type": "unsubscribed", 
-                    "data": {"project_id": project_id}
-                })
-        
-        else:
-            logger.warning(f"Unknown message type: {message_type}")
     
     async def get_connection_stats(self) -> Dict[str, Any]:
         """Get statistics about current connections"""
@@ -4,7 +4,8 @@ Includes bulk operations support from the start.
 """
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import logging
@@ -12,7 +13,9 @@ import time
 from pathlib import Path
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import init_db, close_db, init_pool, close_pool, warm_pools
+from app.repositories.activity_repository import activity_queue
+from app.infrastructure.websocket import manager as websocket_manager
 from app.api.v1.router import api_router
 from app.exceptions.handlers import setup_exception_handlers
 
@@ -38,12 +41,24 @@ async def lifespan(app: FastAPI):
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
+    try:
+        await init_pool()
+    except Exception as e:
+        logger.error(f"asyncpg pool initialization failed: {e}")
+    try:
+        await warm_pools()
+    except Exception as e:
+        logger.error(f"Connection pool warm-up failed: {e}")
+    activity_queue.start()
     logger.info("Application startup complete")
-    
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down...")
+    await activity_queue.stop()
+    await websocket_manager.shutdown()
+    await close_pool()
     await close_db()
     logger.info("Application shutdown complete")
 
@@ -56,6 +71,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson serializes every response at C speed
 )
 
 # Add CORS middleware with explicit methods and enhanced configuration
@@ -69,6 +85,16 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Pure-ASGI auth pre-resolution: cached Bearer tokens are decoded once
+# here instead of re-running the HTTPBearer + Supabase dependency chain
+from app.core.auth import AuthASGIMiddleware
+app.add_middleware(AuthASGIMiddleware)
+
+# Compress JSON list responses (~10x for repetitive payloads); level 5
+# trades a little ratio for much cheaper CPU per response. Small bodies
+# are left alone - the gzip header would cost more than it saves.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Add request timing middleware
 @app.middleware("http")
@@ -92,10 +118,12 @@ async def add_process_time_header(request: Request, call_next):
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint for monitoring"""
+    from app.core.database import pool_status
     return {
         "status": "healthy",
         "version": settings.VERSION,
-        "service": settings.PROJECT_NAME
+        "service": settings.PROJECT_NAME,
+        "db_pool": pool_status()
     }
 
 
@@ -118,5 +146,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
+        # uvloop + httptools (bundled with uvicorn[standard]): C event loop
+        # and HTTP parser instead of asyncio's and h11's pure-Python ones
+        loop="uvloop",
+        http="httptools",
         log_level="info" if settings.DEBUG else "warning"
     )
\ No newline at end of file
@@ -4,7 +4,7 @@ Production-ready models with user roles, projects, subtasks, comments, and maxim
 Designed for efficient bulk operations from the start.
 """
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column
+from sqlalchemy import Column, UniqueConstraint
 from sqlalchemy.dialects.postgresql import ENUM, JSON
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -253,7 +253,12 @@ class Project(SQLModel, table=True):
 class ProjectMember(SQLModel, table=True):
     """Project team members"""
     __tablename__ = "project_members"
-    
+    # One membership row per (project, user); lets add_member rely on
+    # INSERT ... ON CONFLICT instead of a pre-check SELECT
+    __table_args__ = (
+        UniqueConstraint("project_id", "user_id", name="uq_project_members_project_user"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     project_id: uuid.UUID = Field(foreign_key="projects.id", index=True)
     user_id: uuid.UUID = Field(foreign_key="users.id", index=True)
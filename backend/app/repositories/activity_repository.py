@@ -3,13 +3,97 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
 from sqlmodel import select, delete, desc
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.database import UserActivity, ActivityActionType, User, Project
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class ActivityQueue:
+    """In-process queue that coalesces activity inserts into batches.
+
+    A single background flusher drains the queue every 50 ms and writes
+    the batch with one executemany round-trip through the shared asyncpg
+    pool, instead of one INSERT per activity.
+    """
+
+    _INSERT_SQL = """
+        INSERT INTO user_activities
+            (id, user_id, action_type, entity_type, entity_id, entity_name,
+             description, target_user_id, project_id, activity_metadata, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+    """
+    FLUSH_INTERVAL = 0.05  # seconds between flushes
+    MAX_BATCH = 500  # records per executemany
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._flusher_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background flusher. Called at application startup."""
+        if self._flusher_task is None:
+            self._flusher_task = asyncio.create_task(self._flusher())
+            logger.info("Activity queue flusher started")
+
+    async def stop(self):
+        """Stop the flusher, draining any queued records first."""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            self._flusher_task = None
+        await self._flush_once()
+        logger.info("Activity queue flusher stopped")
+
+    async def put(self, activity: UserActivity):
+        """Enqueue an activity row for the next batched flush."""
+        metadata = activity.activity_metadata
+        await self.queue.put((
+            activity.id,
+            activity.user_id,
+            activity.action_type.value if isinstance(activity.action_type, ActivityActionType) else activity.action_type,
+            activity.entity_type,
+            activity.entity_id,
+            activity.entity_name,
+            activity.description,
+            activity.target_user_id,
+            activity.project_id,
+            json.dumps(metadata) if metadata is not None else None,
+            activity.created_at,
+        ))
+
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self._flush_once()
+
+    async def _flush_once(self):
+        batch = []
+        while len(batch) < self.MAX_BATCH:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        if not batch:
+            return
+
+        try:
+            from app.core.database import get_pool
+            pool = await get_pool()
+            await pool.executemany(self._INSERT_SQL, batch)
+            logger.debug(f"Flushed {len(batch)} activities")
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} activities: {str(e)}")
+
+
+# Shared queue instance; the flusher is started from the app lifespan
+activity_queue = ActivityQueue()
+
+
 class ActivityRepository:
     """Repository for managing user activities"""
     
@@ -28,7 +112,11 @@ class ActivityRepository:
         project_id: Optional[UUID] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> UserActivity:
-        """Create a new activity log entry"""
+        """Create a new activity log entry.
+
+        The row is enqueued and written by the batched background flusher,
+        so callers never pay a per-activity INSERT round-trip.
+        """
         try:
             activity = UserActivity(
                 user_id=user_id,
@@ -41,17 +129,14 @@ class ActivityRepository:
                 project_id=project_id,
                 activity_metadata=metadata
             )
-            
-            self.session.add(activity)
-            await self.session.commit()
-            await self.session.refresh(activity)
-            
+
+            await activity_queue.put(activity)
+
             logger.info(f"Activity logged: {description}")
             return activity
-            
+
         except Exception as e:
             logger.error(f"Failed to create activity: {str(e)}")
-            await self.session.rollback()
             raise
     
     async def get_recent(
@@ -63,36 +148,29 @@ class ActivityRepository:
     ) -> List[UserActivity]:
         """Get recent activities with optional filtering"""
         try:
-            query = select(UserActivity).order_by(desc(UserActivity.created_at))
-            
+            # Eager-load user/target_user/project via LEFT JOINs so the whole
+            # page comes back in one round trip instead of 3 queries per row
+            query = (
+                select(UserActivity)
+                .options(
+                    joinedload(UserActivity.user),
+                    joinedload(UserActivity.target_user),
+                    joinedload(UserActivity.project),
+                )
+                .order_by(desc(UserActivity.created_at))
+            )
+
             if user_id:
                 query = query.where(UserActivity.user_id == user_id)
-            
+
             if project_id:
                 query = query.where(UserActivity.project_id == project_id)
-            
+
             query = query.offset(offset).limit(limit)
-            
+
             result = await self.session.execute(query)
             activities = result.scalars().all()
-            
-            # Load relationships
-            for activity in activities:
-                if activity.user_id:
-                    user_query = select(User).where(User.id == activity.user_id)
-                    user_result = await self.session.execute(user_query)
-                    activity.user = user_result.scalars().first()
-                
-                if activity.target_user_id:
-                    target_query = select(User).where(User.id == activity.target_user_id)
-                    target_result = await self.session.execute(target_query)
-                    activity.target_user = target_result.scalars().first()
-                
-                if activity.project_id:
-                    project_query = select(Project).where(Project.id == activity.project_id)
-                    project_result = await self.session.execute(project_query)
-                    activity.project = project_result.scalars().first()
-            
+
             return activities
             
         except Exception as e:
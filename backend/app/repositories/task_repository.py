@@ -3,8 +3,11 @@ Task repository with efficient bulk operations.
 All bulk operations use single SQL queries for maximum performance.
 """
 from sqlmodel import select, update, delete, and_, func
-from sqlalchemy import or_
+from sqlalchemy import or_, any_, cast
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy import bindparam
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -14,9 +17,25 @@ import time
 from app.models.database import Task, TaskHistory, BulkOperationLog, TaskStatus, TaskPriority, Project, ProjectMember
 
 
+def _id_filter(task_ids: List[uuid.UUID], dialect_name: str):
+    """Build the id-membership predicate for a bulk statement.
+
+    ``Task.id.in_(ids)`` expands into one placeholder per id, so a
+    1000-task bulk request produces a 1000-parameter statement that the
+    server must re-plan for every distinct list size. ``= ANY($1)`` keeps
+    the query text constant (asyncpg sends the list as one binary array),
+    so the prepared-statement cache is hit regardless of batch size.
+    uuid[] arrays are PostgreSQL-only; other dialects (the SQLite test
+    suite) fall back to the plain IN expansion.
+    """
+    if dialect_name == "postgresql":
+        return Task.id == any_(cast(task_ids, ARRAY(PG_UUID(as_uuid=True))))
+    return Task.id.in_(task_ids)
+
+
 class TaskRepository:
     """Repository for task operations with bulk support"""
-    
+
     def __init__(self, session: AsyncSession):
         self.session = session
     
@@ -24,11 +43,10 @@ class TaskRepository:
     
     async def create(self, task: Task) -> Task:
         """Create a single task"""
+        # The id is generated client-side and expire_on_commit is False,
+        # so the task and its history entry go out in one INSERT batch -
+        # no post-commit refresh SELECT, no second commit
         self.session.add(task)
-        await self.session.commit()
-        await self.session.refresh(task)
-        
-        # Add history entry
         history = TaskHistory(
             task_id=task.id,
             user_id=task.creator_id,
@@ -37,7 +55,7 @@ class TaskRepository:
         )
         self.session.add(history)
         await self.session.commit()
-        
+
         return task
     
     async def get_by_id(self, task_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Task]:
@@ -119,7 +137,10 @@ class TaskRepository:
         # Add updated_at timestamp
         update_data["updated_at"] = datetime.utcnow()
 
-        # Build and execute update statement with access control
+        # Build and execute update statement with access control.
+        # RETURNING hands the updated row straight back, so the access
+        # check, the update and the "fetch the result" re-SELECT collapse
+        # into one statement.
         stmt = (
             update(Task)
             .where(
@@ -130,12 +151,14 @@ class TaskRepository:
                 )
             )
             .values(**update_data)
+            .returning(Task)
         )
-        
+
         result = await self.session.execute(stmt)
-        if result.rowcount == 0:
+        updated_task = result.scalar_one_or_none()
+        if updated_task is None:
             raise ValueError(f"Task {task_id} not found or access denied")
-        
+
         # Add history entry
         import json
         history = TaskHistory(
@@ -145,11 +168,9 @@ class TaskRepository:
             changes_json=json.dumps(update_data, default=str)
         )
         self.session.add(history)
-        
+
         await self.session.commit()
-        
-        # Get and return updated task
-        updated_task = await self.get_by_id(task_id, user_id)
+
         return updated_task
     
     async def delete(self, task_id: uuid.UUID, user_id: uuid.UUID, hard_delete: bool = False) -> None:
@@ -241,10 +262,12 @@ class TaskRepository:
         task_ids: List[uuid.UUID],
         update_data: Dict[str, Any],
         user_id: uuid.UUID
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """
         Efficiently update multiple tasks with a single query.
-        Returns the number of rows updated.
+        Returns the ids of the rows actually updated (RETURNING id), so
+        callers can report which of the requested tasks were touched
+        without a follow-up query.
         """
         start_time = time.time()
 
@@ -263,26 +286,28 @@ class TaskRepository:
             .where(
                 and_(
                     or_(Task.creator_id == user_id, Task.assignee_id == user_id),
-                    Task.id.in_(task_ids),
+                    _id_filter(task_ids, self.session.bind.dialect.name),
                     Task.is_deleted == False
                 )
             )
             .values(**update_data)
+            .returning(Task.id)
         )
-        
+
         result = await self.session.execute(stmt)
-        affected_count = result.rowcount
-        
+        affected_ids = list(result.scalars().all())
+        affected_count = len(affected_ids)
+
         # Add bulk history entry
         if affected_count > 0:
             import json
             history = TaskHistory(
-                task_id=task_ids[0],  # Reference first task
+                task_id=affected_ids[0],  # Reference first affected task
                 user_id=user_id,
                 action="bulk_update",
                 changes_json=json.dumps({
                     "update_data": update_data,
-                    "affected_ids": [str(id) for id in task_ids],
+                    "affected_ids": [str(id) for id in affected_ids],
                     "affected_count": affected_count
                 }, default=str)
             )
@@ -303,16 +328,16 @@ class TaskRepository:
             success=True
         )
         self.session.add(log_entry)
-        
+
         await self.session.commit()
-        return affected_count
-    
+        return affected_ids
+
     async def bulk_complete(
         self,
         task_ids: List[uuid.UUID],
         user_id: uuid.UUID,
         completed: bool = True
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """
         Mark multiple tasks as complete/incomplete efficiently.
         """
@@ -335,7 +360,7 @@ class TaskRepository:
         task_ids: List[uuid.UUID],
         user_id: uuid.UUID,
         hard_delete: bool = False
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """
         Delete multiple tasks efficiently.
         Supports both soft and hard delete.
@@ -349,15 +374,16 @@ class TaskRepository:
                 .where(
                     and_(
                         or_(Task.creator_id == user_id, Task.assignee_id == user_id),
-                        Task.id.in_(task_ids)
+                        _id_filter(task_ids, self.session.bind.dialect.name)
                     )
                 )
+                .returning(Task.id)
             )
             result = await self.session.execute(stmt)
-            affected_count = result.rowcount
+            affected_ids = list(result.scalars().all())
         else:
             # Soft delete
-            affected_count = await self.bulk_update(
+            affected_ids = await self.bulk_update(
                 task_ids,
                 {
                     "is_deleted": True,
@@ -365,7 +391,8 @@ class TaskRepository:
                 },
                 user_id
             )
-        
+        affected_count = len(affected_ids)
+
         # Log bulk operation
         execution_time = int((time.time() - start_time) * 1000)
         log_entry = BulkOperationLog(
@@ -381,16 +408,16 @@ class TaskRepository:
             success=True
         )
         self.session.add(log_entry)
-        
+
         await self.session.commit()
-        return affected_count
-    
+        return affected_ids
+
     async def bulk_change_status(
         self,
         task_ids: List[uuid.UUID],
         user_id: uuid.UUID,
         new_status: TaskStatus
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """Change status for multiple tasks"""
         return await self.bulk_update(
             task_ids,
@@ -403,7 +430,7 @@ class TaskRepository:
         task_ids: List[uuid.UUID],
         user_id: uuid.UUID,
         new_priority: TaskPriority
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """Change priority for multiple tasks"""
         return await self.bulk_update(
             task_ids,
@@ -416,7 +443,7 @@ class TaskRepository:
         task_ids: List[uuid.UUID],
         user_id: uuid.UUID,
         category_id: Optional[uuid.UUID]
-    ) -> int:
+    ) -> List[uuid.UUID]:
         """Assign category to multiple tasks"""
         return await self.bulk_update(
             task_ids,
@@ -451,22 +478,12 @@ class TaskRepository:
             "todo": (stats.total or 0) - (stats.completed or 0) - (stats.in_progress or 0)
         }
     
-    async def list_with_filters(
-        self,
-        user_id: uuid.UUID,
-        project_id: Optional[uuid.UUID] = None,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> tuple[List[Task], int]:
-        """List tasks with filters and pagination - matches API endpoint expectation"""
-        if filters is None:
-            filters = {}
-        
-        # Build base query depending on project scope
+    def _apply_list_access(self, stmt, user_id: uuid.UUID, project_id: Optional[uuid.UUID]):
+        """Join and filter a statement down to tasks the user can see."""
         if project_id:
             # User can view all tasks in project if owner or member
-            # Use group_by to ensure unique tasks when user has multiple relationships
-            stmt = (
-                select(Task)
+            return (
+                stmt
                 .join(Project, Project.id == Task.project_id)
                 .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
                 .where(
@@ -479,66 +496,143 @@ class TaskRepository:
                         )
                     )
                 )
-                .group_by(Task.id)
             )
-        else:
-            # No project filter: show tasks from all projects where user is a member, or tasks they created/assigned
-            # Use group_by to ensure unique tasks when user has multiple relationships
-            stmt = (
-                select(Task)
-                .outerjoin(Project, Project.id == Task.project_id)
-                .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
-                .where(
-                    and_(
-                        Task.is_deleted == False,
-                        or_(
-                            Task.creator_id == user_id,
-                            Task.assignee_id == user_id,
-                            Project.owner_id == user_id,
-                            ProjectMember.user_id == user_id
-                        )
+        # No project filter: tasks from all projects where user is a member,
+        # or tasks they created / are assigned to
+        return (
+            stmt
+            .outerjoin(Project, Project.id == Task.project_id)
+            .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(
+                and_(
+                    Task.is_deleted == False,
+                    or_(
+                        Task.creator_id == user_id,
+                        Task.assignee_id == user_id,
+                        Project.owner_id == user_id,
+                        ProjectMember.user_id == user_id
                     )
                 )
-                .group_by(Task.id)
             )
-        
-        # Apply filters
+        )
+
+    @staticmethod
+    def _apply_list_filters(stmt, filters: Dict[str, Any]):
+        """Apply the optional status/priority/category/assignee filters."""
         if filters.get('status'):
             if isinstance(filters['status'], list):
                 stmt = stmt.where(Task.status.in_(filters['status']))
             else:
                 stmt = stmt.where(Task.status == filters['status'])
-        
+
         if filters.get('priority'):
             if isinstance(filters['priority'], list):
                 stmt = stmt.where(Task.priority.in_(filters['priority']))
             else:
                 stmt = stmt.where(Task.priority == filters['priority'])
-        
+
         if filters.get('category_id'):
             stmt = stmt.where(Task.category_id == filters['category_id'])
-        
+
         if filters.get('assignee_id'):
             stmt = stmt.where(Task.assignee_id == filters['assignee_id'])
+
+        return stmt
+
+    async def list_fingerprint(
+        self,
+        user_id: uuid.UUID,
+        project_id: Optional[uuid.UUID] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> tuple[Optional[datetime], int]:
+        """Cheap change fingerprint for a filtered listing.
+
+        Returns (max updated_at, distinct task count) over exactly the
+        same access joins and filters as list_with_filters - enough to
+        derive an ETag without hydrating a single Task.
+        """
+        stmt = self._apply_list_access(
+            select(func.max(Task.updated_at), func.count(func.distinct(Task.id))),
+            user_id,
+            project_id,
+        )
+        stmt = self._apply_list_filters(stmt, filters or {})
+        row = (await self.session.execute(stmt)).one()
+        return row[0], row[1] or 0
+
+    async def iter_with_filters(
+        self,
+        user_id: uuid.UUID,
+        project_id: Optional[uuid.UUID] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """Stream tasks matching the same access rules and filters.
+
+        Server-side cursor via stream_scalars: rows are yielded as they
+        arrive instead of materializing the whole page, so memory stays
+        flat regardless of limit and the first task can go out on the
+        wire before the last one is fetched.
+        """
+        if filters is None:
+            filters = {}
+
+        stmt = self._apply_list_access(select(Task), user_id, project_id)
+        stmt = (
+            self._apply_list_filters(stmt, filters)
+            .group_by(Task.id)
+            .options(raiseload('*'))
+            .order_by(Task.created_at.desc())
+            .limit(filters.get('limit', 50))
+            .offset(filters.get('offset', 0))
+        )
+
+        result = await self.session.stream_scalars(stmt)
+        async for task in result:
+            yield task
+
+    async def list_with_filters(
+        self,
+        user_id: uuid.UUID,
+        project_id: Optional[uuid.UUID] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> tuple[List[Task], int]:
+        """List tasks with filters and pagination - matches API endpoint expectation"""
+        if filters is None:
+            filters = {}
         
-        # Count total before pagination
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        count_result = await self.session.execute(count_stmt)
-        total = count_result.scalar() or 0
-        
+        # The window count rides along in the same SELECT: it is computed
+        # over the filtered set before LIMIT/OFFSET apply, so the total
+        # comes back on every row and the separate COUNT(*) query (which
+        # re-ran the whole filter plan) is gone.
+        total_col = func.count().over().label("_total")
+
+        stmt = self._apply_list_access(select(Task, total_col), user_id, project_id)
+        # group_by ensures unique tasks when the user has multiple
+        # relationships fanning out through the membership join.
+        # raiseload guards the hot path: serialization reads columns only
+        # (tags live in tags_json), so any relationship access here would
+        # be an accidental N+1 - fail loudly instead of lazy-loading.
+        stmt = (
+            self._apply_list_filters(stmt, filters)
+            .group_by(Task.id)
+            .options(raiseload('*'))
+        )
+
         # Apply pagination
         limit = filters.get('limit', 50)
         offset = filters.get('offset', 0)
         stmt = stmt.limit(limit).offset(offset)
-        
+
         # Apply ordering
         stmt = stmt.order_by(Task.created_at.desc())
-        
-        # Execute query
+
+        # Execute query - each row is (Task, total)
         result = await self.session.execute(stmt)
-        tasks = result.scalars().all()
-        
-        return list(tasks), total
+        rows = result.all()
+        tasks = [row[0] for row in rows]
+        total = rows[0][1] if rows else 0
+
+        return tasks, total
     
     async def search(
         self,
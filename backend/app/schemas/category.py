@@ -109,8 +109,13 @@ class CategoryResponse(BaseModel):
 
     @classmethod
     def from_category(cls, category, task_count: int = 0) -> "CategoryResponse":
-        """Convert Category model to response schema"""
-        return cls(
+        """Convert Category model to response schema.
+
+        Uses model_construct: the fields come straight from the database
+        row, so re-running validators once per category per request is
+        pure overhead.
+        """
+        return cls.model_construct(
             id=category.id,
             name=category.name,
             description=category.description,
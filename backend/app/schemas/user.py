@@ -20,3 +20,4 @@ class PublicUser(BaseModel):
 class UserListResponse(BaseModel):
 	users: List[PublicUser]
 	total: int
+	next_cursor: Optional[str] = None
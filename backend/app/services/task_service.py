@@ -85,7 +85,7 @@ class TaskService:
             return False  # Already completed
         
         result = await self.repository.bulk_complete([task_id], user_id, True)
-        return result > 0
+        return len(result) > 0
     
     async def bulk_complete_tasks(
         self,
@@ -110,10 +110,10 @@ class TaskService:
                 "message": "No accessible tasks found"
             }
         
-        affected_count = await self.repository.bulk_complete(
+        affected_count = len(await self.repository.bulk_complete(
             accessible_tasks, user_id, completed
-        )
-        
+        ))
+
         return {
             "requested_count": len(task_ids),
             "affected_count": affected_count,
@@ -148,10 +148,10 @@ class TaskService:
                 "message": "No valid fields to update"
             }
         
-        affected_count = await self.repository.bulk_update(
+        affected_count = len(await self.repository.bulk_update(
             task_ids, filtered_data, user_id
-        )
-        
+        ))
+
         return {
             "requested_count": len(task_ids),
             "affected_count": affected_count,
@@ -194,5 +194,5 @@ class TaskService:
             {"assignee_id": assignee_id},
             user_id
         )
-        
-        return result > 0
\ No newline at end of file
+
+        return len(result) > 0
\ No newline at end of file
@@ -3,6 +3,7 @@ Authentication helper utilities.
 Business logic and validation helpers for authentication operations.
 """
 from typing import Dict, Any, Optional
+from functools import lru_cache
 import logging
 from datetime import datetime
 import uuid
@@ -56,16 +57,44 @@ class AuthResponseFormatter:
     
     @staticmethod
     def format_user_response(user: Any) -> Dict[str, Any]:
-        """Format user data for response"""
+        """Format user data for response.
+
+        Delegates to an LRU-cached builder keyed by the scalar fields, so
+        repeat /me hits for the same user revision skip the formatting work.
+        Any user mutation changes the key and naturally busts the entry.
+        """
+        return AuthResponseFormatter._format_user_cached(
+            str(user.id),
+            user.email,
+            user.username,
+            user.full_name,
+            getattr(user, 'avatar_url', None),
+            getattr(user, 'bio', None),
+            user.is_active,
+            user.created_at.isoformat()
+        ).copy()
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_user_cached(
+        user_id: str,
+        email: str,
+        username: Optional[str],
+        full_name: Optional[str],
+        avatar_url: Optional[str],
+        bio: Optional[str],
+        is_active: bool,
+        created_at: str
+    ) -> Dict[str, Any]:
         return {
-            "id": str(user.id),
-            "email": user.email,
-            "username": user.username,
-            "full_name": user.full_name,
-            "avatar_url": getattr(user, 'avatar_url', None),
-            "bio": getattr(user, 'bio', None),
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat()
+            "id": user_id,
+            "email": email,
+            "username": username,
+            "full_name": full_name,
+            "avatar_url": avatar_url,
+            "bio": bio,
+            "is_active": is_active,
+            "created_at": created_at
         }
 
 
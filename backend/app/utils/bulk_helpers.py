@@ -3,6 +3,7 @@ Bulk operations helper utilities.
 Business logic and validation helpers for bulk task operations.
 """
 from typing import List, Optional, Dict, Any
+from functools import lru_cache
 import uuid
 import logging
 import time
@@ -15,6 +16,17 @@ from app.exceptions.base import ValidationError, BusinessLogicError
 logger = logging.getLogger(__name__)
 
 
+def _failed_ids(task_ids: List[uuid.UUID], affected_ids: List[uuid.UUID]) -> List[uuid.UUID]:
+    """Requested IDs that RETURNING did not report back, in request order.
+
+    The membership set is built once up front - inlining set(affected_ids)
+    in the comprehension rebuilds it per element, turning a 1000-task
+    batch into a million hashes.
+    """
+    affected = set(affected_ids)
+    return [tid for tid in task_ids if tid not in affected]
+
+
 class BulkOperationValidator:
     """Bulk operation validation utilities"""
     
@@ -32,7 +44,7 @@ class BulkOperationValidator:
         if len(unique_ids) != len(task_ids):
             raise ValidationError("Duplicate task IDs found in bulk operation")
         
-        logger.info(f"Bulk {operation_type} operation validated for {len(task_ids)} tasks")
+        logger.info("Bulk %s operation validated for %d tasks", operation_type, len(task_ids))
     
     @staticmethod
     def validate_bulk_update_data(update_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,27 +95,27 @@ class BulkOperationExecutor:
         operation_type = "bulk_complete"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks")
+        logger.info("Starting %s for %d tasks", operation_type, len(task_ids))
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_complete(
+        affected_ids = await repo.bulk_complete(
             task_ids=task_ids,
             user_id=user_id,
             completed=completed
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
-        # Determine failed IDs
-        failed_ids = []
-        if affected_count < len(task_ids):
-            # For now, we don't have detailed failure info, so we can't specify which ones failed
-            logger.warning(f"Bulk complete: {len(task_ids) - affected_count} tasks failed")
-        
+
+        # RETURNING id tells us exactly which rows were touched
+        failed_ids = _failed_ids(task_ids, affected_ids)
+        if failed_ids:
+            logger.warning("Bulk complete: %d tasks failed", len(failed_ids))
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
@@ -117,7 +129,7 @@ class BulkOperationExecutor:
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be updated (not found or access denied)")
         
-        logger.info(f"Bulk complete completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk complete completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
     
     @staticmethod
@@ -131,7 +143,7 @@ class BulkOperationExecutor:
         operation_type = "bulk_update"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks with data: {update_data}")
+        logger.info("Starting %s for %d tasks with data: %s", operation_type, len(task_ids), update_data)
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
@@ -145,28 +157,29 @@ class BulkOperationExecutor:
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_update(
+        affected_ids = await repo.bulk_update(
             task_ids=task_ids,
             update_data=validated_data,
             user_id=user_id
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
             "affected_count": affected_count,
             "success": affected_count == len(task_ids),
             "execution_time_ms": execution_time,
-            "failed_ids": [],
+            "failed_ids": _failed_ids(task_ids, affected_ids),
             "warnings": []
         }
         
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be updated (not found or access denied)")
         
-        logger.info(f"Bulk update completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk update completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
     
     @staticmethod
@@ -180,28 +193,29 @@ class BulkOperationExecutor:
         operation_type = "bulk_delete"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks (hard_delete={hard_delete})")
+        logger.info("Starting %s for %d tasks (hard_delete=%s)", operation_type, len(task_ids), hard_delete)
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_delete(
+        affected_ids = await repo.bulk_delete(
             task_ids=task_ids,
             user_id=user_id,
             hard_delete=hard_delete
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
             "affected_count": affected_count,
             "success": affected_count == len(task_ids),
             "execution_time_ms": execution_time,
-            "failed_ids": [],
+            "failed_ids": _failed_ids(task_ids, affected_ids),
             "warnings": []
         }
         
@@ -211,7 +225,7 @@ class BulkOperationExecutor:
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be deleted (not found or access denied)")
         
-        logger.info(f"Bulk delete completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk delete completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
     
     @staticmethod
@@ -225,35 +239,36 @@ class BulkOperationExecutor:
         operation_type = "bulk_change_status"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks to status {new_status}")
+        logger.info("Starting %s for %d tasks to status %s", operation_type, len(task_ids), new_status)
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_change_status(
+        affected_ids = await repo.bulk_change_status(
             task_ids=task_ids,
             user_id=user_id,
             new_status=new_status
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
             "affected_count": affected_count,
             "success": affected_count == len(task_ids),
             "execution_time_ms": execution_time,
-            "failed_ids": [],
+            "failed_ids": _failed_ids(task_ids, affected_ids),
             "warnings": []
         }
         
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be updated (not found or access denied)")
         
-        logger.info(f"Bulk status change completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk status change completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
     
     @staticmethod
@@ -267,35 +282,36 @@ class BulkOperationExecutor:
         operation_type = "bulk_change_priority"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks to priority {new_priority}")
+        logger.info("Starting %s for %d tasks to priority %s", operation_type, len(task_ids), new_priority)
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_change_priority(
+        affected_ids = await repo.bulk_change_priority(
             task_ids=task_ids,
             user_id=user_id,
             new_priority=new_priority
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
             "affected_count": affected_count,
             "success": affected_count == len(task_ids),
             "execution_time_ms": execution_time,
-            "failed_ids": [],
+            "failed_ids": _failed_ids(task_ids, affected_ids),
             "warnings": []
         }
         
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be updated (not found or access denied)")
         
-        logger.info(f"Bulk priority change completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk priority change completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
     
     @staticmethod
@@ -309,7 +325,7 @@ class BulkOperationExecutor:
         operation_type = "bulk_assign_category"
         start_time = time.time()
         
-        logger.info(f"Starting {operation_type} for {len(task_ids)} tasks to category {category_id}")
+        logger.info("Starting %s for %d tasks to category %s", operation_type, len(task_ids), category_id)
         
         # Validate operation
         BulkOperationValidator.validate_bulk_operation_limits(task_ids, operation_type)
@@ -319,21 +335,22 @@ class BulkOperationExecutor:
         
         # Execute operation
         repo = TaskRepository(session)
-        affected_count = await repo.bulk_assign_category(
+        affected_ids = await repo.bulk_assign_category(
             task_ids=task_ids,
             user_id=user_id,
             category_id=category_id
         )
-        
+        affected_count = len(affected_ids)
+
         execution_time = int((time.time() - start_time) * 1000)
-        
+
         result = {
             "operation": operation_type,
             "requested_count": len(task_ids),
             "affected_count": affected_count,
             "success": affected_count == len(task_ids),
             "execution_time_ms": execution_time,
-            "failed_ids": [],
+            "failed_ids": _failed_ids(task_ids, affected_ids),
             "warnings": []
         }
         
@@ -343,7 +360,7 @@ class BulkOperationExecutor:
         if affected_count < len(task_ids):
             result["warnings"].append(f"{len(task_ids) - affected_count} tasks could not be updated (not found or access denied)")
         
-        logger.info(f"Bulk category assign completed: {affected_count}/{len(task_ids)} tasks affected")
+        logger.info("Bulk category assign completed: %d/%d tasks affected", affected_count, len(task_ids))
         return result
 
 
@@ -353,7 +370,7 @@ class BulkOperationLogger:
     @staticmethod
     def log_bulk_operation_start(operation_type: str, task_count: int, user_id: uuid.UUID):
         """Log start of bulk operation"""
-        logger.info(f"Bulk operation started: {operation_type} for {task_count} tasks by user {user_id}")
+        logger.info("Bulk operation started: %s for %d tasks by user %s", operation_type, task_count, user_id)
     
     @staticmethod
     def log_bulk_operation_complete(
@@ -364,22 +381,43 @@ class BulkOperationLogger:
         user_id: uuid.UUID
     ):
         """Log completion of bulk operation"""
-        success_rate = (affected_count / requested_count * 100) if requested_count > 0 else 0
-        logger.info(
-            f"Bulk operation completed: {operation_type} - "
-            f"{affected_count}/{requested_count} tasks ({success_rate:.1f}%) "
-            f"in {execution_time_ms}ms by user {user_id}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            success_rate = (affected_count / requested_count * 100) if requested_count > 0 else 0
+            logger.info(
+                "Bulk operation completed: %s - %d/%d tasks (%.1f%%) in %dms by user %s",
+                operation_type, affected_count, requested_count,
+                success_rate, execution_time_ms, user_id
+            )
     
     @staticmethod
     def log_bulk_operation_validation_error(operation_type: str, error: str, user_id: uuid.UUID):
         """Log bulk operation validation errors"""
-        logger.warning(f"Bulk operation validation failed: {operation_type} - {error} - user {user_id}")
+        logger.warning("Bulk operation validation failed: %s - %s - user %s", operation_type, error, user_id)
 
 
 class BulkOperationAnalyzer:
     """Bulk operation analysis and optimization utilities"""
     
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _efficiency_stats(
+        requested_count: int,
+        affected_count: int,
+        execution_time_ms: int
+    ) -> tuple:
+        """Pure-numeric core, memoized on its integer inputs.
+
+        Repeated bulk requests of the same shape (common with paginated
+        clients retrying fixed-size batches) hit the cache instead of
+        recomputing the ratios and rating thresholds.
+        """
+        success_rate = (affected_count / requested_count * 100) if requested_count > 0 else 0
+        tasks_per_second = (affected_count / (execution_time_ms / 1000)) if execution_time_ms > 0 else 0
+        rating = ("excellent" if success_rate >= 95 and tasks_per_second >= 100 else
+                  "good" if success_rate >= 85 and tasks_per_second >= 50 else
+                  "fair" if success_rate >= 70 else "poor")
+        return success_rate, round(tasks_per_second, 2), rating
+
     @staticmethod
     def analyze_operation_efficiency(
         operation_type: str,
@@ -388,20 +426,17 @@ class BulkOperationAnalyzer:
         execution_time_ms: int
     ) -> Dict[str, Any]:
         """Analyze bulk operation efficiency"""
-        success_rate = (affected_count / requested_count * 100) if requested_count > 0 else 0
-        tasks_per_second = (affected_count / (execution_time_ms / 1000)) if execution_time_ms > 0 else 0
-        
-        analysis = {
+        success_rate, tasks_per_second, rating = BulkOperationAnalyzer._efficiency_stats(
+            requested_count, affected_count, execution_time_ms
+        )
+
+        return {
             "operation_type": operation_type,
             "success_rate": success_rate,
-            "tasks_per_second": round(tasks_per_second, 2),
+            "tasks_per_second": tasks_per_second,
             "execution_time_ms": execution_time_ms,
-            "efficiency_rating": "excellent" if success_rate >= 95 and tasks_per_second >= 100 else
-                                "good" if success_rate >= 85 and tasks_per_second >= 50 else
-                                "fair" if success_rate >= 70 else "poor"
+            "efficiency_rating": rating
         }
-        
-        return analysis
     
     @staticmethod
     def suggest_optimization(
@@ -295,9 +295,28 @@ class CategoryQueryHelper:
         result = await session.execute(stmt)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_task_counts_for_categories(
+        category_ids: List[uuid.UUID],
+        session: AsyncSession
+    ) -> Dict[uuid.UUID, int]:
+        """Get active-task counts for many categories in one grouped query"""
+        if not category_ids:
+            return {}
+
+        stmt = select(Task.category_id, func.count(Task.id)).where(
+            and_(
+                Task.category_id.in_(category_ids),
+                Task.is_deleted == False
+            )
+        ).group_by(Task.category_id)
+
+        result = await session.execute(stmt)
+        return {category_id: count for category_id, count in result.all()}
+
     @staticmethod
     async def get_task_count_for_category(
-        category_id: uuid.UUID, 
+        category_id: uuid.UUID,
         session: AsyncSession
     ) -> int:
         """Get number of active tasks in a category"""
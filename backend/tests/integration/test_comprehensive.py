@@ -204,7 +204,7 @@ async def test_repository_layer():
         
         # Test task assignment
         result = await repo.bulk_update([created_task1.id], {"assignee_id": assignee.id}, user.id)
-        assert result == 1
+        assert len(result) == 1
         
         # Now assignee should have access
         assignee_access = await repo.get_by_id(created_task1.id, assignee.id)
@@ -232,15 +232,15 @@ async def test_repository_layer():
         
         # Test bulk status change
         affected = await repo.bulk_change_status(task_ids, user.id, TaskStatus.IN_PROGRESS)
-        assert affected == 5
+        assert len(affected) == 5
         
         # Test bulk priority change
         affected = await repo.bulk_change_priority(task_ids, user.id, TaskPriority.URGENT)
-        assert affected == 5
+        assert len(affected) == 5
         
         # Test bulk completion
         affected = await repo.bulk_complete(task_ids[:3], user.id, True)
-        assert affected == 3
+        assert len(affected) == 3
         
         # Test user tasks retrieval
         user_tasks = await repo.get_user_tasks(user.id)
@@ -257,7 +257,7 @@ async def test_repository_layer():
         
         # Test bulk deletion
         affected = await repo.bulk_delete(task_ids[3:], user.id, hard_delete=False)
-        assert affected == 2  # Soft delete
+        assert len(affected) == 2  # Soft delete
         
         print("✅ Repository layer operations working correctly")
 
@@ -134,7 +134,7 @@ async def test_relationships():
         
         # Assign task
         result = await repo.bulk_update([created_task.id], {"assignee_id": assignee_user.id}, user.id)
-        assert result > 0
+        assert len(result) > 0
         
         # Test assignee relationship
         await session.refresh(created_task, ["assignee"])
@@ -104,8 +104,8 @@ async def test_repository_fixed():
         # Update task to assign it
         task_update = {"assignee_id": assignee_user.id}
         result = await repo.bulk_update([created_task.id], task_update, user.id)
-        assert result > 0
-        print(f"✅ Task assigned successfully: {result} tasks affected")
+        assert len(result) > 0
+        print(f"✅ Task assigned successfully: {len(result)} tasks affected")
         
         # Test that assignee can access the task
         assignee_task = await repo.get_by_id(created_task.id, assignee_user.id)
@@ -121,8 +121,8 @@ async def test_repository_fixed():
         
         # Test bulk complete
         complete_result = await repo.bulk_complete([created_task.id], user.id)
-        assert complete_result > 0
-        print(f"✅ Bulk complete works: {complete_result} tasks completed")
+        assert len(complete_result) > 0
+        print(f"✅ Bulk complete works: {len(complete_result)} tasks completed")
         
         # Test task stats
         stats = await repo.get_task_stats(user.id)